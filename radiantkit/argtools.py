@@ -11,6 +11,7 @@ import pickle as pk
 import radiantkit as ra
 from radiantkit import const
 import sys
+from typing import Optional
 
 
 def check_axes(axes: str) -> None:
@@ -62,16 +63,40 @@ def add_threads_argument(parser: argparse._ArgumentGroup) -> argparse._ArgumentG
         "--threads",
         metavar="NUMBER",
         type=int,
-        default=1,
-        help="""Number of threads for parallelization. Default: 1""",
+        default=None,
+        help="""Number of threads for parallelization. Default: all CPUs available
+        to the process (accounting for CPU affinity and container limits).""",
     )
     return parser
 
 
-def check_threads(threads: int) -> int:
+def check_threads(threads: Optional[int]) -> int:
+    # joblib's cpu_count honours the CPU affinity mask and cgroup quotas
+    if threads is None:
+        return cpu_count()
     return max(1, min(cpu_count(), threads))
 
 
+def add_compression_level_argument(
+    parser: argparse._ArgumentGroup,
+) -> argparse._ArgumentGroup:
+    parser.add_argument(
+        "--compression-level",
+        metavar="NUMBER",
+        type=int,
+        dest="compression_level",
+        default=1,
+        help="""Deflate level (1-9) used with --compressed. Higher levels yield
+        slightly smaller files but are much slower to write. Default: 1""",
+    )
+    return parser
+
+
+def check_compression_level(level: int) -> int:
+    assert 1 <= level <= 9, f"compression level must be in 1-9, got {level}."
+    return level
+
+
 def add_pattern_argument(parser: argparse._ArgumentGroup) -> argparse._ArgumentGroup:
     parser.add_argument(
         "--inreg",
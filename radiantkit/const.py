@@ -19,6 +19,8 @@ default_subfolder = "objects"
 
 default_plot_npoints = 200
 
+default_chunk_size = 16
+
 
 class ProjectionType(Enum):
     SUM = "SUM_PROJECTION"
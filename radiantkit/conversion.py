@@ -9,24 +9,35 @@ from czifile import CziFile  # type: ignore
 import logging
 from logging import Logger, getLogger
 from nd2reader import ND2Reader  # type: ignore
+from nd2reader.common import read_chunk  # type: ignore
 from nd2reader.parser import Parser as ND2Parser  # type: ignore
 import numpy as np  # type: ignore
+from pims import Frame  # type: ignore
 from radiantkit import stat
 from radiantkit.string import TIFFNameTemplate as TNTemplate
 import re
 import six  # type: ignore
-from typing import DefaultDict, Iterable, List, Optional, Tuple
+import threading
+from typing import DefaultDict, FrozenSet, Iterable, List, Optional, Tuple
 import warnings
 import xml.etree.ElementTree as ET
 
+try:
+    from nd2reader.stitched import remove_parsed_unwanted_bytes  # type: ignore
+except ImportError:  # nd2reader < 3.3
+    remove_parsed_unwanted_bytes = None
+
 
 class ND2Reader2(ND2Reader):
     _xy_resolution: float
     _z_resolution: DefaultDict[float, int]
+    _field_resolutionZ: List[List[float]]
     _dtype: str
+    __image_group: Optional[Tuple[int, Optional[np.ndarray]]] = None
 
     def __init__(self, filename):
         super(ND2Reader2, self).__init__(filename)
+        self.__image_group_lock = threading.Lock()
         self._set_xy_resolution()
         self._set_z_resolution()
         self._set_proposed_dtype()
@@ -98,9 +109,10 @@ class ND2Reader2(ND2Reader):
             logging.warning("XY resolution set to 0! (possibly incorrect obj. setup)")
 
     def _set_z_resolution(self):
+        self._field_resolutionZ = self._read_field_resolutionZ()
         self._z_resolution: DefaultDict[float, int] = defaultdict(lambda: 0)
-        for field_id in range(self.field_count()):
-            for delta_z in self.get_field_resolutionZ(field_id):
+        for z_steps in self._field_resolutionZ:
+            for delta_z in z_steps:
                 self._z_resolution[delta_z] += 1
 
     def _set_proposed_dtype(self) -> None:
@@ -178,22 +190,80 @@ class ND2Reader2(ND2Reader):
             parsed_fields[2],
         )
 
-    def get_field_resolutionZ(self, field_id: int) -> List[float]:
+    def _read_field_resolutionZ(self) -> List[List[float]]:
         with open(self.filename, "rb") as ND2H:
             parser = ND2Parser(ND2H)
             z_fields, z_step, z_unit = self.get_Z_loop_step(parser)
             if 0 != z_fields:
-                return [z_step]
+                return [[z_step] for field_id in range(self.field_count())]
             Zdata = np.array(parser._raw_metadata.z_data)
             Zlevels = np.array(parser.metadata["z_levels"]).astype("int")
-            Zlevels = Zlevels + len(Zlevels) * field_id
-            Zdata = Zdata[Zlevels]
-            return np.round(np.diff(Zdata), 3).tolist()
+            return [
+                np.round(np.diff(Zdata[Zlevels + len(Zlevels) * field_id]), 3).tolist()
+                for field_id in range(self.field_count())
+            ]
+
+    def get_field_resolutionZ(self, field_id: int) -> List[float]:
+        return list(self._field_resolutionZ[field_id])
+
+    def _read_image_group(self, image_group_number: int) -> Optional[np.ndarray]:
+        # The file handle and the cached chunk are shared, e.g., with the
+        # read-ahead thread of nd2_to_tiff, so seek+read+cache happen together.
+        with self.__image_group_lock:
+            image_group = self.__image_group
+            if image_group is None or image_group_number != image_group[0]:
+                data = read_chunk(
+                    self._parser._fh,
+                    self._parser._label_map.get_image_data_location(image_group_number),
+                )
+                image_group = (
+                    image_group_number,
+                    None if data is None else np.frombuffer(data, dtype=np.uint16),
+                )
+                self.__image_group = image_group
+            return image_group[1]
+
+    def get_frame_2D(self, c=0, t=0, z=0, x=0, y=0, v=0):
+        # All channels of a plane are interleaved in a single image group chunk,
+        # which ND2Reader reads from disk again for every channel. Decode them
+        # from the last chunk read instead. nd2reader exposes no chunk-level
+        # read, so this needs its parser internals, and falls back to the
+        # stock reader when they are not there.
+        if remove_parsed_unwanted_bytes is None:
+            return super(ND2Reader2, self).get_frame_2D(c, t, z, x, y, v)
+        height = self.metadata["height"]
+        width = self.metadata["width"]
+        image_group_data = self._read_image_group(
+            self._parser._calculate_image_group_number(t, v, z)
+        )
+        if image_group_data is None:
+            return Frame([], frame_no=t, metadata=self._parser._get_frame_metadata())
+
+        image_data_start = 4 + c
+        image_group_data = remove_parsed_unwanted_bytes(
+            image_group_data, image_data_start, height, width
+        )
+        channel_count = int(len(image_group_data[4:]) / (height * width))
+        image_data = image_group_data[image_data_start::channel_count]
+        return Frame(
+            image_data.reshape((height, len(image_data) // height)),
+            frame_no=t,
+            metadata=self._parser._get_frame_metadata(),
+        )
 
     def select_channels(self, channels: List[str]) -> List[str]:
-        return [
-            c.lower() for c in channels if c.lower() in list(self.get_channel_names())
-        ]
+        available = frozenset(self.get_channel_names())
+        return [c.lower() for c in channels if c.lower() in available]
+
+    def select_channel_ids(self, channels: Optional[List[str]]) -> FrozenSet[int]:
+        if channels is None:
+            return frozenset(range(self.channel_count()))
+        selected = frozenset(self.select_channels(channels))
+        return frozenset(
+            channel_id
+            for channel_id, channel_name in enumerate(self.get_channel_names())
+            if channel_name in selected
+        )
 
     def get_tiff_path(
         self, template: TNTemplate, channel_id: int, field_id: int
@@ -210,16 +280,18 @@ class ND2Reader2(ND2Reader):
 
 class CziFile2(CziFile):
     __pixels: Optional[np.ndarray] = None
+    __out: Optional[str] = None
     axes: str
 
-    def __init__(self, filename):
+    def __init__(self, filename, out: Optional[str] = None):
         super(CziFile2, self).__init__(filename)
+        self.__out = out
 
     @property
     def pixels(self) -> np.ndarray:
         if self.__pixels is None:
             with warnings.catch_warnings(record=True):
-                self.__pixels = self.asarray()
+                self.__pixels = self.asarray(out=self.__out)
         return self.__pixels
 
     def log_details(self, logger: Logger = getLogger()) -> None:
@@ -236,10 +308,10 @@ class CziFile2(CziFile):
 
         logger.info(f"Channels: {list(self.get_channel_names())}.")
 
-        x_size = self.pixels.shape[self.axes.index("X")]
-        y_size = self.pixels.shape[self.axes.index("Y")]
-        if self.is3D:
-            z_size = self.pixels.shape[self.axes.index("Z")]
+        x_size = self.shape[self.axes.index("X")]
+        y_size = self.shape[self.axes.index("Y")]
+        if self.is3D():
+            z_size = self.shape[self.axes.index("Z")]
             logger.info(f"XYZ size: {x_size} x {y_size} x {z_size}")
         else:
             logger.info(f"XY size: {x_size} x {y_size}")
@@ -250,7 +322,7 @@ class CziFile2(CziFile):
     def field_count(self) -> int:
         if "S" not in self.axes:
             return 1
-        return self.pixels.shape[self.axes.index("S")]
+        return self.shape[self.axes.index("S")]
 
     def isLive(self) -> bool:
         if "T" in self.axes:
@@ -276,10 +348,25 @@ class CziFile2(CziFile):
         if "C" not in self.axes:
             n = 1
         else:
-            n = self.pixels.shape[self.axes.index("C")]
+            n = self.shape[self.axes.index("C")]
         assert len(list(self.get_channel_names())) == n, "channel count mismatch."
         return n
 
+    def get_bit_depth(self, channel_id: int) -> Optional[int]:
+        if "u" != np.dtype(self.dtype).kind:
+            return None
+        metadata = ET.fromstring(self.metadata())
+        channel_path = "Metadata/Information/Image/Dimensions/Channels/Channel"
+        channels = metadata.findall(channel_path)
+        bit_count = None
+        if channel_id < len(channels):
+            bit_count = channels[channel_id].find("ComponentBitCount")
+        if bit_count is None:
+            bit_count = metadata.find("Metadata/Information/Image/ComponentBitCount")
+        if bit_count is None or bit_count.text is None:
+            return None
+        return min(int(bit_count.text), np.dtype(self.dtype).itemsize * 8)
+
     def get_axis_resolution(self, axis: str) -> float:
         resolution_path = "Metadata/Scaling/Items/Distance"
         for x in ET.fromstring(self.metadata()).findall(resolution_path):
@@ -331,9 +418,18 @@ class CziFile2(CziFile):
             yield (field[channel_id], channel_id)
 
     def select_channels(self, channels: List[str]) -> List[str]:
-        return [
-            c.lower() for c in channels if c.lower() in list(self.get_channel_names())
-        ]
+        available = frozenset(self.get_channel_names())
+        return [c.lower() for c in channels if c.lower() in available]
+
+    def select_channel_ids(self, channels: Optional[List[str]]) -> FrozenSet[int]:
+        if channels is None:
+            return frozenset(range(self.channel_count()))
+        selected = frozenset(self.select_channels(channels))
+        return frozenset(
+            channel_id
+            for channel_id, channel_name in enumerate(self.get_channel_names())
+            if channel_name in selected
+        )
 
     def get_tiff_path(
         self, template: TNTemplate, channel_id: int, field_id: int
@@ -38,15 +38,7 @@ def get_huygens_rescaling_factor(path: str) -> float:
         logging.debug(f"no Huygens log found: '{path}'")
         return 1
 
-    with open(path, "r") as log:
-        factor = [x for x in log.readlines() if "Stretched to Integer type" in x]
-
-    if 0 == len(factor):
-        return 1
-    elif 1 == len(factor):
-        return float(factor[0].strip().split(" ")[-1])
-    else:
-        return float(np.prod([float(f.strip().split(" ")[-1]) for f in factor]))
+    return get_log_rescaling_factor(path, "Stretched to Integer type")
 
 
 def get_deconwolf_rescaling_factor(path: str) -> float:
@@ -55,12 +47,13 @@ def get_deconwolf_rescaling_factor(path: str) -> float:
         logging.debug(f"no deconwolf log found: '{path}'")
         return 1
 
+    return get_log_rescaling_factor(path, "scaling: ")
+
+
+def get_log_rescaling_factor(path: str, needle: str) -> float:
     with open(path, "r") as log:
-        factor = [x for x in log.readlines() if "scaling: " in x]
+        factors = [float(x.strip().split(" ")[-1]) for x in log if needle in x]
 
-    if 0 == len(factor):
+    if 0 == len(factors):
         return 1
-    elif 1 == len(factor):
-        return float(factor[0].strip().split(" ")[-1])
-    else:
-        return float(np.prod([float(f.strip().split(" ")[-1]) for f in factor]))
+    return float(np.prod(factors))
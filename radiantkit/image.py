@@ -13,10 +13,6 @@ from radiantkit import const, stat
 from radiantkit.deconvolution import get_deconvolution_rescaling_factor
 from scipy import ndimage as ndi  # type: ignore
 import skimage as ski  # type: ignore
-from skimage.morphology import square, cube  # type: ignore
-from skimage.morphology import closing, opening
-from skimage.morphology import dilation, erosion
-from skimage.segmentation import clear_border  # type: ignore
 import tifffile as tf  # type: ignore
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -73,7 +69,11 @@ class Image(ImageBase):
     _shape: Tuple[int, ...]
 
     def __init__(
-        self, pixels: np.ndarray, path: Optional[str] = None, axes: Optional[str] = None
+        self,
+        pixels: np.ndarray,
+        path: Optional[str] = None,
+        axes: Optional[str] = None,
+        copy: bool = False,
     ):
         super(ImageBase, self).__init__()
         assert len(pixels.shape) <= len(self._ALLOWED_AXES)
@@ -86,7 +86,9 @@ class Image(ImageBase):
             self._axes_order = self._ALLOWED_AXES[
                 (len(self._ALLOWED_AXES) - len(pixels.shape)) : len(self._ALLOWED_AXES)
             ]
-        self._pixels = pixels.copy()
+        if copy:
+            pixels = np.array(pixels, copy=True)
+        self._pixels = pixels
         self._shape = pixels.shape
         self._remove_empty_axes()
         self._shape = self._pixels.shape
@@ -172,8 +174,8 @@ class Image(ImageBase):
         return 0 < self._pixels.shape[0]
 
     @staticmethod
-    def from_tiff(path: str) -> "Image":
-        return Image(read_tiff(path), path)
+    def from_tiff(path: str, mmap: bool = False) -> "Image":
+        return Image(read_tiff(path, mmap=mmap), path)
 
     def _extract_nd(self) -> None:
         self._pixels = extract_nd(self._pixels, self.nd)
@@ -229,7 +231,7 @@ class Image(ImageBase):
     def load_from_local(self) -> None:
         assert self._path_to_local is not None
         assert os.path.isfile(self._path_to_local), self._path_to_local
-        self._pixels = self.from_tiff(self._path_to_local).pixels
+        self._pixels = self.from_tiff(self._path_to_local)._pixels
 
     def unload(self) -> None:
         if self._path_to_local is None:
@@ -256,7 +258,7 @@ class Image(ImageBase):
             bundle_axes = self._axes_order
         save_tiff(
             path,
-            self.pixels.astype(self.dtype),
+            self.pixels.astype(self.dtype, copy=False),
             compressed,
             bundle_axes,
             inMicrons,
@@ -268,14 +270,19 @@ class Image(ImageBase):
     def offset(self, offset: int) -> np.ndarray:
         return offset2(self.pixels, offset)
 
+    def crop(self, bounds: Tuple[slice, ...]) -> np.ndarray:
+        return self.pixels[bounds]
+
     def copy(self) -> "Image":
-        return self.from_this(self.pixels, True)
+        return self.from_this(self.pixels, True, copy=True)
 
-    def from_this(self, pixels: np.ndarray, keepPath: bool = False) -> "Image":
+    def from_this(
+        self, pixels: np.ndarray, keepPath: bool = False, copy: bool = False
+    ) -> "Image":
         if keepPath:
-            I2 = type(self)(pixels, self._path_to_local, self.axes)
+            I2 = type(self)(pixels, self._path_to_local, self.axes, copy=copy)
         else:
-            I2 = type(self)(pixels, axes=self.axes)
+            I2 = type(self)(pixels, axes=self.axes, copy=copy)
         I2.aspect = self.aspect
         return I2
 
@@ -299,11 +306,12 @@ class ImageLabeled(Image):
         path: Optional[str] = None,
         axes: Optional[str] = None,
         doRelabel: bool = True,
+        copy: bool = False,
     ):
-        super(ImageLabeled, self).__init__(pixels, path, axes)
+        super(ImageLabeled, self).__init__(pixels, path, axes, copy)
         if doRelabel:
             self._relabel()
-        self._pixels = self._pixels.astype("uint16")
+        self._pixels = self._pixels.astype("uint16", copy=False)
 
     @property
     def max(self):
@@ -316,14 +324,13 @@ class ImageLabeled(Image):
         return ImageLabeled(read_tiff(path), path, axes, doRelabel)
 
     def _relabel(self) -> None:
-        self._pixels = self.pixels.copy() > self.pixels.min()
-        self._pixels = ski.measure.label(self._pixels)
+        self._pixels = ski.measure.label(self.pixels > self.pixels.min())
 
-    def clear_XY_borders(self) -> None:
-        self._pixels = clear_XY_borders(self._pixels)
+    def clear_XY_borders(self, compact: bool = True) -> None:
+        self._pixels = clear_XY_borders(self._pixels, compact)
 
-    def clear_Z_borders(self) -> None:
-        self._pixels = clear_Z_borders(self._pixels)
+    def clear_Z_borders(self, compact: bool = True) -> None:
+        self._pixels = clear_Z_borders(self._pixels, compact)
 
     def sizeXY(self, lab: int) -> int:
         return self.size(lab, "XY")
@@ -331,12 +338,17 @@ class ImageLabeled(Image):
     def sizeZ(self, lab: int) -> int:
         return self.size(lab, "Z")
 
-    def size(self, lab: int, axes: str) -> int:
+    def __get_projection_axes(self, axes: str) -> Tuple[int, ...]:
         assert all([axis in self.axes for axis in axes]), (self.axes, axes)
-        axes_ids = tuple(
-            [self.axes.index(axis) for axis in self.axes if axis not in axes]
-        )
-        return (self.pixels == lab).max(axes_ids).sum()
+        return tuple([self.axes.index(axis) for axis in self.axes if axis not in axes])
+
+    def size(self, lab: int, axes: str) -> int:
+        assert lab > 0
+        axes_ids = self.__get_projection_axes(axes)
+        bounds = ndi.find_objects(self.pixels, max_label=lab)[lab - 1]
+        if bounds is None:
+            return 0
+        return (self.pixels[bounds] == lab).max(axes_ids).sum()
 
     def __remove_labels_by_size(
         self,
@@ -360,27 +372,32 @@ class ImageLabeled(Image):
             )
         )
         logging.debug(np.array((labels_array, sizes)))
-        self.pixels[np.isin(self.pixels, labels_array[filtered])] = 0
-        self._pixels = ski.measure.label(self.pixels)
+        self._pixels = ski.measure.label(
+            remove_labels(self.pixels, labels_array[filtered])
+        )
         logging.info(f"retained {self.max} labels")
 
     def filter_size(
         self, axes: str, pass_range: Tuple[Union[int, float], Union[int, float]]
     ) -> None:
-        labels = np.unique(self.pixels)
-        labels = labels[0 != labels]
+        axes_ids = self.__get_projection_axes(axes)
+        labels = []
         sizes = []
-        for current_label in labels:
+        for current_label, bounds in enumerate(ndi.find_objects(self.pixels), 1):
+            if bounds is None:
+                continue
             logging.debug(f"Calculating {axes} size for label {current_label}")
-            sizes.append(self.size(current_label, axes))
+            labels.append(current_label)
+            sizes.append((self.pixels[bounds] == current_label).max(axes_ids).sum())
         self.__remove_labels_by_size(labels, np.array(sizes), pass_range, axes)
 
     def filter_total_size(self, pass_range: Tuple[float, float]) -> None:
-        labels, sizes = np.unique(self.pixels, return_counts=True)
-        self.__remove_labels_by_size(labels, sizes, pass_range)
+        sizes = np.bincount(self.pixels.ravel())
+        labels = np.flatnonzero(sizes)
+        self.__remove_labels_by_size(labels, sizes[labels], pass_range)
 
     def inherit_labels(self, mask2d: "ImageLabeled") -> None:
-        self._pixels = inherit_labels(self, mask2d).pixels
+        self._pixels = inherit_labels(self, mask2d, out=self._pixels).pixels
 
     def binarize(self) -> "ImageBinary":
         B = ImageBinary(self.pixels, None, self._axes_order)
@@ -403,11 +420,12 @@ class ImageBinary(Image):
         path: Optional[str] = None,
         axes: Optional[str] = None,
         doRebinarize: bool = True,
+        copy: bool = False,
     ):
-        super(ImageBinary, self).__init__(pixels, path, axes)
+        super(ImageBinary, self).__init__(pixels, path, axes, copy)
         if doRebinarize:
             self._rebinarize()
-        self._pixels = self._pixels.astype(bool)
+        self._pixels = self._pixels.astype(bool, copy=False)
         self._foreground = float(self.pixels.sum())
         self._background = float(np.prod(self.pixels.shape) - self._foreground)
 
@@ -426,7 +444,7 @@ class ImageBinary(Image):
         return ImageBinary(read_tiff(path), path, axes, doRebinarize)
 
     def _rebinarize(self) -> None:
-        self._pixels = (self.pixels > self.pixels.min()).astype(int)
+        self._pixels = self.pixels > self.pixels.min()
 
     def fill_holes(self) -> None:
         self._pixels = fill_holes(self.pixels)
@@ -477,9 +495,12 @@ class ImageBinary(Image):
     ) -> None:
         if bundle_axes is None:
             bundle_axes = self._axes_order
+        # Binary pixels always fit uint8, scale them in place after one cast.
+        pixels = self.pixels.astype(np.uint8)
+        pixels *= np.iinfo(np.uint8).max
         save_tiff(
             path,
-            (self.pixels * np.iinfo(self.dtype).max).astype(self.dtype),
+            pixels,
             compressed,
             bundle_axes,
             inMicrons,
@@ -494,6 +515,21 @@ class ImageBinary(Image):
         s += f"; Background voxels: {self.background}"
         return s
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pickle masks as packed bits, i.e., 1 bit instead of 1 byte per voxel
+        state = self.__dict__.copy()
+        if "_pixels" in state and bool == state["_pixels"].dtype:
+            pixels = state.pop("_pixels")
+            state["_packed_pixels"] = (np.packbits(pixels, axis=None), pixels.shape)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        if "_packed_pixels" in state:
+            packed, shape = state.pop("_packed_pixels")
+            pixels = np.unpackbits(packed, count=int(np.prod(shape)))
+            state["_pixels"] = pixels.view(bool).reshape(shape)
+        self.__dict__.update(state)
+
 
 class SliceDescriptorMode(Enum):
     GRADIENT_OF_MAGNITUDE = "Gradient of magnitude"
@@ -511,8 +547,9 @@ class ImageGrayScale(Image):
         path: Optional[str] = None,
         axes: Optional[str] = None,
         do_rescale: bool = False,
+        copy: bool = False,
     ):
-        super(ImageGrayScale, self).__init__(pixels, path, axes)
+        super(ImageGrayScale, self).__init__(pixels, path, axes, copy)
         if do_rescale:
             self._rescale_factor = self.get_deconvolution_rescaling_factor()
 
@@ -538,15 +575,22 @@ class ImageGrayScale(Image):
     def pixels(self) -> np.ndarray:
         return super(ImageGrayScale, self).pixels / self._rescale_factor
 
+    def crop(self, bounds: Tuple[slice, ...]) -> np.ndarray:
+        return super(ImageGrayScale, self).pixels[bounds] / self._rescale_factor
+
     @staticmethod
     def from_tiff(
         path: str,
         axes: Optional[str] = None,
         do_rescale: bool = False,
         default_axes: str = const.default_axes[1:],
+        mmap: bool = False,
     ) -> "ImageGrayScale":
         img = ImageGrayScale(
-            read_tiff(path, default_axes=default_axes), path, axes, do_rescale
+            read_tiff(path, default_axes=default_axes, mmap=mmap),
+            path,
+            axes,
+            do_rescale,
         )
         return img
 
@@ -555,11 +599,24 @@ class ImageGrayScale(Image):
             return 1.0
         return get_deconvolution_rescaling_factor(self._path_to_local)
 
+    def get_otsu_threshold(self, step: int = 1) -> float:
+        # Computed on the raw intensities, so integer images are histogrammed
+        # per value with bincount instead of being rescaled to float first.
+        sample = super(ImageGrayScale, self).pixels[
+            tuple(slice(None, None, step) for _ in self.shape)
+        ]
+        return ski.filters.threshold_otsu(sample) / self._rescale_factor
+
     def threshold_global(self, thr: Union[int, float]) -> ImageBinary:
         return ImageBinary(self.pixels > thr, doRebinarize=False, axes=self.axes)
 
     def threshold_adaptive(
-        self, block_size: int, method: str, mode: str, *args, **kwargs
+        self,
+        block_size: Union[int, Tuple[int, ...]],
+        method: str,
+        mode: str,
+        *args,
+        **kwargs,
     ) -> ImageBinary:
         return ImageBinary(
             threshold_adaptive(self.pixels, block_size, method, mode, *args, **kwargs),
@@ -635,6 +692,10 @@ def get_dtype(imax: Union[int, float]) -> str:
     return "uint"
 
 
+def get_dtype_from_bits(bits: int) -> str:
+    return get_dtype(2 ** bits - 1)
+
+
 def get_bundle_axes_from_metadata(
     t: tf.TiffFile, default_axes: str = const.default_axes[1:]
 ) -> str:
@@ -648,19 +709,31 @@ def get_bundle_axes_from_metadata(
                     f"read axes field from {metadata_field}: {metadata['axes']}"
                 )
                 return metadata["axes"]
-    return bundle_axes[-len(t.asarray().shape) :]
+    return bundle_axes[-len(t.series[0].shape) :]
+
+
+def memmap_tiff(t: tf.TiffFile) -> np.ndarray:
+    try:
+        return tf.memmap(t.filehandle.path, mode="c")
+    except ValueError:
+        logging.debug(f"cannot memory-map '{t.filehandle.path}', reading it.")
+        return t.asarray()
 
 
 def read_tiff(
     path: str,
     expected_axes: Optional[str] = "ZYX",
     default_axes: str = const.default_axes[1:],
+    mmap: bool = False,
 ) -> np.ndarray:
+    # Memory-mapping is opt-in: a copy-on-write map breaks when the source is
+    # overwritten while mapped, and loky sends mapped arrays back from workers
+    # as references to the file, dropping any in-memory edit.
     assert os.path.isfile(path), f"file not found: '{path}'"
     try:
-        t = tf.TiffFile(path)
-        bundle_axes = get_bundle_axes_from_metadata(t, default_axes)
-        img = t.asarray()
+        with tf.TiffFile(path) as t:
+            bundle_axes = get_bundle_axes_from_metadata(t, default_axes)
+            img = memmap_tiff(t) if mmap else t.asarray()
     except (ValueError, TypeError) as e:
         logging.critical(f"cannot read image '{path}', file seems corrupted.\n{e}")
         raise
@@ -757,6 +830,10 @@ def enforce_default_axis_bundle(
     return (img, bundle_axes)
 
 
+def needs_bigtiff(nbytes: int) -> bool:
+    return nbytes > 2 ** 32 - 2 ** 25
+
+
 def save_tiff(
     path: str,
     img: np.ndarray,
@@ -766,6 +843,7 @@ def save_tiff(
     z_resolution: Optional[float] = None,
     forImageJ: bool = True,
     forceTZCYX: bool = True,
+    compression_level: int = 9,
     **kwargs,
 ) -> None:
     assert len(bundle_axes) == len(
@@ -782,7 +860,23 @@ def save_tiff(
         metadata["unit"] = "um"
     if z_resolution is not None:
         metadata["spacing"] = z_resolution
-    compressionLevel = 0 if not compressed else 9
+    compressionLevel = 0 if not compressed else compression_level
+    # tifffile switches to BigTIFF by itself only for uncompressed data, so
+    # large compressed stacks could overflow the classic 4 GB offsets.
+    # ImageJ hyperstacks cannot be BigTIFF, so those are written as plain
+    # BigTIFF instead, keeping the axes and resolution metadata.
+    if compressed and "bigtiff" not in kwargs and needs_bigtiff(img.nbytes):
+        if forImageJ:
+            logging.warning(
+                "".join(
+                    [
+                        f"{img.nbytes} bytes do not fit in an ImageJ TIFF, ",
+                        f"writing '{path}' as a BigTIFF without ImageJ metadata.",
+                    ]
+                )
+            )
+            forImageJ = False
+        kwargs["bigtiff"] = True
 
     tf.imwrite(
         path,
@@ -798,9 +892,10 @@ def save_tiff(
 
 def z_project(img: np.ndarray, projection_type: const.ProjectionType) -> np.ndarray:
     if projection_type == const.ProjectionType.SUM:
-        img = np.array(img.sum(0).astype(img.dtype))
+        # Accumulating in the input dtype wraps exactly like casting back did
+        img = np.asarray(img.sum(0, dtype=img.dtype))
     elif projection_type == const.ProjectionType.MAX:
-        img = np.array(img.max(0).astype(img.dtype))
+        img = np.asarray(img.max(0))
     return img
 
 
@@ -819,9 +914,34 @@ def offset2(img: np.ndarray, offset: int) -> np.ndarray:
 
 
 def threshold_adaptive(
-    img: np.ndarray, block_size: int, method: str, mode: str, *args, **kwargs
+    img: np.ndarray,
+    block_size: Union[int, Tuple[int, ...]],
+    method: str,
+    mode: str,
+    *args,
+    **kwargs,
 ) -> np.ndarray:
-    assert 1 == block_size % 2
+    if isinstance(block_size, int):
+        block_size = (1,) * (len(img.shape) - 2) + (block_size, block_size)
+    assert len(img.shape) == len(block_size)
+    assert all(1 == side % 2 for side in block_size)
+
+    if "mean" == method:
+        if 0 != len(args):
+            raise TypeError(
+                "".join(
+                    [
+                        "the mean adaptive threshold takes its options ",
+                        f"(offset, cval) as keywords, got positional {args}.",
+                    ]
+                )
+            )
+        kwargs.pop("param", None)  # ignored by skimage's "mean" as well
+        return threshold_adaptive_mean(img, block_size, mode, **kwargs)
+
+    assert all(1 == side for side in block_size[:-2])
+    assert block_size[-2] == block_size[-1]
+    side = block_size[-1]
 
     def threshold_adaptive_slice(
         img: np.ndarray, block_size: int, method: str, mode: str, *args, **kwargs
@@ -832,14 +952,20 @@ def threshold_adaptive(
         return img >= threshold
 
     if 2 == len(img.shape):
-        mask = threshold_adaptive_slice(img, block_size, method, mode, *args, **kwargs)
+        mask = threshold_adaptive_slice(img, side, method, mode, *args, **kwargs)
     elif 3 == len(img.shape):
-        mask = img.copy()
-        for slice_id in range(mask.shape[0]):
+        threshold = np.empty(img.shape, dtype=float)
+        for slice_id in range(img.shape[0]):
             logging.debug(f"ADAPT_THR SLICE#({slice_id})")
-            mask[slice_id, :, :] = threshold_adaptive_slice(
-                mask[slice_id, :, :], block_size, method, mode, *args, **kwargs
+            threshold[slice_id, :, :] = ski.filters.threshold_local(
+                img[slice_id, :, :],
+                side,
+                *args,
+                method=method,
+                mode=mode,
+                **kwargs,
             )
+        mask = img >= threshold
     else:
         logging.info(
             "".join(
@@ -853,13 +979,47 @@ def threshold_adaptive(
     return mask
 
 
+def threshold_adaptive_mean(
+    img: np.ndarray,
+    block_size: Tuple[int, ...],
+    mode: str,
+    offset: float = 0,
+    cval: float = 0,
+    chunk_size: int = const.default_chunk_size,
+) -> np.ndarray:
+    # Box filtering with running sums does not depend on the block size,
+    # unlike skimage's convolution-based "mean". Chunks along the first axis
+    # carry a halo of half a block, so only one chunk of thresholds is kept in
+    # memory and the result matches filtering the whole image at once.
+    mask = np.empty(img.shape, dtype=bool)
+    halo = block_size[0] // 2
+    for start in range(0, img.shape[0], chunk_size):
+        stop = min(start + chunk_size, img.shape[0])
+        chunk_start = max(0, start - halo)
+        chunk = img[chunk_start : min(img.shape[0], stop + halo)]
+        threshold = ndi.uniform_filter(
+            chunk,
+            block_size,
+            output=np.empty(chunk.shape, dtype=np.float32),
+            mode=mode,
+            cval=cval,
+        )
+        threshold -= offset
+        core = slice(start - chunk_start, stop - chunk_start)
+        mask[start:stop] = chunk[core] >= threshold[core]
+    return mask
+
+
 def fill_holes(mask: np.ndarray) -> np.ndarray:
-    mask = ndi.binary_fill_holes(mask)
-    if 3 == len(mask.shape):
-        for slice_id in range(mask.shape[0]):
-            logging.debug(f"FILL_HOLES SLICE#({slice_id})")
-            mask[slice_id, :, :] = ndi.binary_fill_holes(mask[slice_id, :, :])
-    elif 2 != len(mask.shape):
+    if 2 == len(mask.shape):
+        mask = ndi.binary_fill_holes(mask)
+    elif 3 == len(mask.shape):
+        # XY-only connectivity fills every slice in one call, which also
+        # covers any hole enclosed in 3D.
+        structure = np.zeros((3, 3, 3), dtype=bool)
+        structure[1] = ndi.generate_binary_structure(2, 1)
+        mask = ndi.binary_fill_holes(mask, structure)
+    else:
         logging.warning(
             "".join(
                 [
@@ -872,13 +1032,21 @@ def fill_holes(mask: np.ndarray) -> np.ndarray:
     return mask
 
 
+def _box_morphology(operation, mask: np.ndarray, block_side: int) -> np.ndarray:
+    # Flat box footprints are separable in ndi, i.e., one 1D min/max pass per
+    # axis. Even sides are edge-padded as skimage does for eccentric footprints.
+    pad = block_side - 1 if 0 == block_side % 2 else 0
+    if 0 == pad:
+        return operation(mask, size=block_side)
+    mask = operation(np.pad(mask, pad, mode="edge"), size=block_side)
+    return mask[tuple([slice(pad, -pad)] * len(mask.shape))]
+
+
 def closing2(mask: np.ndarray, block_side: int = 3) -> np.ndarray:
     assert 1 == mask.max()
     if block_side > 1:
-        if 2 == len(mask.shape):
-            mask = closing(mask, square(block_side))
-        elif 3 == len(mask.shape):
-            mask = closing(mask, cube(block_side))
+        if len(mask.shape) in (2, 3):
+            mask = _box_morphology(ndi.grey_closing, mask, block_side)
         else:
             logging.info(
                 "".join(
@@ -895,10 +1063,8 @@ def closing2(mask: np.ndarray, block_side: int = 3) -> np.ndarray:
 def opening2(mask: np.ndarray, block_side: int = 3) -> np.ndarray:
     assert 1 == mask.max()
     if block_side > 1:
-        if 2 == len(mask.shape):
-            mask = opening(mask, square(block_side))
-        elif 3 == len(mask.shape):
-            mask = opening(mask, cube(block_side))
+        if len(mask.shape) in (2, 3):
+            mask = _box_morphology(ndi.grey_opening, mask, block_side)
         else:
             logging.info(
                 "".join(
@@ -915,10 +1081,8 @@ def opening2(mask: np.ndarray, block_side: int = 3) -> np.ndarray:
 def dilate(mask: np.ndarray, block_side: int = 3) -> np.ndarray:
     assert 1 == mask.max()
     if block_side > 1:
-        if 2 == len(mask.shape):
-            mask = dilation(mask, square(block_side))
-        elif 3 == len(mask.shape):
-            mask = dilation(mask, cube(block_side))
+        if len(mask.shape) in (2, 3):
+            mask = ndi.grey_dilation(mask, size=block_side)
         else:
             logging.info(
                 "".join(
@@ -936,9 +1100,12 @@ def erode(mask: np.ndarray, block_side: int = 3) -> np.ndarray:
     assert 1 == mask.max()
     if block_side > 1:
         if 2 == len(mask.shape):
-            mask = erosion(mask, square(block_side))
+            # skimage shifts even-sided 2D footprints by one pixel; keep that
+            mask = ndi.grey_erosion(
+                mask, size=block_side, origin=-1 if 0 == block_side % 2 else 0
+            )
         elif 3 == len(mask.shape):
-            mask = erosion(mask, cube(block_side))
+            mask = ndi.grey_erosion(mask, size=block_side)
         else:
             logging.info(
                 "".join(
@@ -952,18 +1119,43 @@ def erode(mask: np.ndarray, block_side: int = 3) -> np.ndarray:
     return mask
 
 
-def clear_XY_borders(L: np.ndarray) -> np.ndarray:
+def get_kept_labels(L: np.ndarray, *labels: np.ndarray) -> np.ndarray:
+    label_arrays = [np.asarray(label_array, dtype=np.intp) for label_array in labels]
+    max_label = max(
+        [int(L.max())] + [int(a.max()) for a in label_arrays if 0 != a.size]
+    )
+    keep = np.ones(max_label + 1, dtype=bool)
+    for label_array in label_arrays:
+        keep[label_array] = False
+    return keep
+
+
+def remove_labels(L: np.ndarray, *labels: np.ndarray) -> np.ndarray:
+    L *= get_kept_labels(L, *labels)[L]
+    return L
+
+
+def get_XY_borders(L: np.ndarray) -> List[np.ndarray]:
+    return [L[..., 0, :], L[..., -1, :], L[..., :, 0], L[..., :, -1]]
+
+
+def get_Z_borders(L: np.ndarray) -> List[np.ndarray]:
+    return [L[0, :, :], L[-1, :, :]] if 3 == len(L.shape) else []
+
+
+def compact_labels(L: np.ndarray) -> np.ndarray:
+    present = np.bincount(L.ravel()) != 0
+    present[0] = False
+    return np.cumsum(present).astype(L.dtype)[L]
+
+
+def clear_XY_borders(L: np.ndarray, compact: bool = True) -> np.ndarray:
     if 2 == len(L.shape):
-        return clear_border(L)
+        # Same output as skimage's clear_border: a new array, labels untouched.
+        return remove_labels(L.copy(), *get_XY_borders(L))
     elif 3 == len(L.shape):
-        border_labels: List[int] = []
-        border_labels.extend(np.unique(L[:, 0, :]).tolist())
-        border_labels.extend(np.unique(L[:, -1, :]).tolist())
-        border_labels.extend(np.unique(L[:, :, 0]).tolist())
-        border_labels.extend(np.unique(L[:, :, -1]).tolist())
-        for lab in set(border_labels):
-            L[L == lab] = 0
-        return ski.measure.label(L)
+        L = remove_labels(L, *get_XY_borders(L))
+        return compact_labels(L) if compact else L
     else:
         logging.warning(
             "".join(
@@ -976,16 +1168,12 @@ def clear_XY_borders(L: np.ndarray) -> np.ndarray:
         raise ValueError
 
 
-def clear_Z_borders(L: np.ndarray) -> np.ndarray:
+def clear_Z_borders(L: np.ndarray, compact: bool = True) -> np.ndarray:
     if 2 == len(L.shape):
         return L
     elif 3 == len(L.shape):
-        border_labels: List[int] = []
-        border_labels.extend(np.unique(L[0, :, :]).tolist())
-        border_labels.extend(np.unique(L[-1, :, :]).tolist())
-        for lab in set(border_labels):
-            L[L == lab] = 0
-        return ski.measure.label(L)
+        L = remove_labels(L, *get_Z_borders(L))
+        return compact_labels(L) if compact else L
     else:
         logging.warning(
             "".join(
@@ -999,20 +1187,19 @@ def clear_Z_borders(L: np.ndarray) -> np.ndarray:
 
 
 def inherit_labels(
-    mask: Union[ImageBinary, ImageLabeled], mask2d: Union[ImageBinary, ImageLabeled]
+    mask: Union[ImageBinary, ImageLabeled],
+    mask2d: Union[ImageBinary, ImageLabeled],
+    out: Optional[np.ndarray] = None,
 ) -> ImageLabeled:
     assert 2 == len(mask2d.shape)
-    if 2 == len(mask.shape):
-        assert mask2d.shape == mask.shape
-        return mask2d.pixels[np.logical_and(mask.pixels > 0, mask2d.pixels > 0)]
-    elif 3 == len(mask.shape):
+    if len(mask.shape) in (2, 3):
         assert mask2d.shape == mask.shape[-2:]
-        new_mask = mask.pixels.copy()
-        for slice_id in range(mask.shape[0]):
-            new_mask[slice_id, :, :] = mask2d.pixels[
-                np.logical_and(mask.pixels[slice_id, :, :] > 0, mask2d.pixels > 0)
-            ]
-        return ImageLabeled(new_mask, doRelabel=False)
+        # 2D labels broadcast over the Z slices of a 3D mask, out can be the
+        # mask's own pixels to avoid allocating a new volume.
+        return ImageLabeled(
+            np.multiply(mask.pixels > 0, mask2d.pixels, out=out, casting="unsafe"),
+            doRelabel=False,
+        )
     else:
         logging.warning(
             "".join(
@@ -15,11 +15,11 @@ from radiantkit.image import Image, ImageBinary, ImageLabeled, offset2
 from radiantkit.selection import BoundingElement
 from radiantkit.stat import cell_cycle_fit, range_from_fit
 from rich.progress import track  # type: ignore
+from scipy import ndimage as ndi  # type: ignore
 from skimage.measure import marching_cubes_lewiner  # type: ignore
 from skimage.measure import mesh_surface_area
 from skimage.morphology import convex_hull_image  # type: ignore
 from typing import Any, Dict, List, Optional, Tuple, Type
-from skimage.filters import threshold_otsu #ADDED
 
 
 
@@ -27,6 +27,7 @@ class ParticleBase(ImageBinary):
     _region_of_interest: BoundingElement
     idx: Optional[int] = None
     _total_size: Optional[int] = None
+    _volume: Optional[int] = None
     _surface: Optional[int] = None
 
     def __init__(
@@ -49,9 +50,21 @@ class ParticleBase(ImageBinary):
             self._total_size = self.foreground
         return self._total_size
 
+    @property
+    def aspect(self) -> np.ndarray:
+        return super(ParticleBase, self).aspect
+
+    @aspect.setter
+    def aspect(self, spacing: np.ndarray) -> None:
+        ImageBinary.aspect.fset(self, spacing)
+        self._volume = None
+        self._surface = None
+
     @property
     def volume(self) -> int:
-        return int(self.total_size * np.prod(self.aspect))
+        if self._volume is None:
+            self._volume = int(self.total_size * np.prod(self.aspect))
+        return self._volume
 
     @property
     def surface(self) -> float:
@@ -77,7 +90,7 @@ class ParticleBase(ImageBinary):
         axes_idxs = tuple(
             [self.axes.index(a) for a in self.axes if a not in axes_to_measure]
         )
-        return int(self._pixels.max(axes_idxs).sum())
+        return int(np.count_nonzero(self._pixels.any(axes_idxs)))
 
     def offset_class(self, offset: int) -> "ParticleBase":
         pixels = offset2(self.pixels, offset)
@@ -85,7 +98,11 @@ class ParticleBase(ImageBinary):
         particle.aspect = self.aspect
         return particle
 
-    def from_this(self, pixels: np.ndarray, keepPath: bool = False) -> "ParticleBase":
+    def from_this(
+        self, pixels: np.ndarray, keepPath: bool = False, copy: bool = False
+    ) -> "ParticleBase":
+        if copy:
+            pixels = np.array(pixels, copy=True)
         I2 = type(self)(pixels, self.roi, self.axes)
         I2.aspect = self.aspect
         return I2
@@ -128,14 +145,14 @@ class Particle(ParticleBase):
         else:
             self._intensity[channel_name] = {}
 
-        pixels = self._region_of_interest.apply(img)[self.pixels]
+        pixels = self._region_of_interest.apply(img, copy=False)[self.pixels]
         if img.background is not None:
             pixels -= img.background
         self._intensity[channel_name]["mean"] = float(np.mean(pixels))
         self._intensity[channel_name]["sum"] = np.sum(pixels)
 
     def get_intensity_value_counts(self, img: ImageGrayScale) -> List[np.ndarray]:
-        pixels = self._region_of_interest.apply(img)[self.pixels]
+        pixels = self._region_of_interest.apply(img, copy=False)[self.pixels]
         img.unload()
         if img.background is not None:
             pixels -= img.background
@@ -172,20 +189,20 @@ class Nucleus(Particle):
         self._lamina_dist, self._center_dist = distances
 
     def get_intensity_at_distance( #CHANGED
-        self, img: ImageGrayScale, img2: ImageGrayScale, ref: Optional[ImageGrayScale] = None
+        self,
+        img: ImageGrayScale,
+        img2_segment: ImageBinary,
+        ref: Optional[ImageGrayScale] = None,
     ) -> pd.DataFrame:
         assert self._lamina_dist is not None and self._center_dist is not None
-        
-        #ADDED
-        global_threshold = threshold_otsu(img2.pixels)
-        img2_segment = img.threshold_global(global_threshold) #makes true or false!!
 
+        voxels = np.nonzero(self.pixels)
         df = pd.DataFrame.from_dict(
             dict(
-                ivalue=self._region_of_interest.apply(img)[self.pixels],
-                lamina_dist=self._lamina_dist[self.pixels],
-                ivalue_tmr = self._region_of_interest.apply(img2_segment)[self.pixels], #ADDED
-                center_dist=self._center_dist[self.pixels],
+                ivalue=self._region_of_interest.apply(img, copy=False)[voxels],
+                lamina_dist=self._lamina_dist[voxels],
+                ivalue_tmr = self._region_of_interest.apply(img2_segment, copy=False)[voxels], #ADDED
+                center_dist=self._center_dist[voxels],
             )
         )
 
@@ -195,16 +212,17 @@ class Nucleus(Particle):
         df["nucleus_label"] = self.idx
 
         if ref is not None:
-            ref_value = self._region_of_interest.apply(ref)[self.pixels]
+            ref_value = self._region_of_interest.apply(ref, copy=False)[voxels]
             df["ivalue_norm"] = df["ivalue"].values / ref_value
 
         return df
 
 
 class NucleiList(object):
-    def __init__(self, nuclei: List[Nucleus]):
+    def __init__(self, nuclei: List[Nucleus], data: Optional[pd.DataFrame] = None):
         super(NucleiList, self).__init__()
         self.__nuclei = nuclei
+        self.__data = data
 
     @property
     def nuclei(self):
@@ -223,7 +241,9 @@ class NucleiList(object):
             nucleus.init_intensity_features(img)
             nucleus.source = rawpath
 
-        return NucleiList(nuclei)
+        # Features are complete at this point, so the table can be built
+        # here (in the worker, when parallelized) without going stale.
+        return NucleiList(nuclei, NucleiList.__tabulate(nuclei))
 
     @staticmethod
     def from_multiple_fields_of_view(
@@ -232,7 +252,7 @@ class NucleiList(object):
         do_rescale: bool = True,
         threads: int = 1,
     ) -> "NucleiList":
-        if 1 == threads:
+        if 1 == threads or 1 >= len(masklist):
             nuclei = []
             for rawpath, maskpath in track(masklist):
                 nuclei.append(
@@ -243,7 +263,11 @@ class NucleiList(object):
                     )
                 )
         else:
-            nuclei = joblib.Parallel(n_jobs=threads, verbose=11)(
+            # Workers receive paths and return per-nucleus crops, so nothing
+            # large crosses the process boundary; no memmapping is needed.
+            nuclei = joblib.Parallel(
+                n_jobs=min(threads, len(masklist)), backend="loky", verbose=11
+            )(
                 joblib.delayed(NucleiList.from_field_of_view)(
                     os.path.join(ipath, maskpath),
                     os.path.join(ipath, rawpath),
@@ -256,25 +280,37 @@ class NucleiList(object):
 
     @staticmethod
     def concat(lists: List["NucleiList"]) -> "NucleiList":
-        return NucleiList(list(itertools.chain(*[nl.nuclei for nl in lists])))
+        if 0 == len(lists):
+            return NucleiList([])
+        nuclei = list(itertools.chain(*[nl.__nuclei for nl in lists]))
+        if any(nl.__data is None for nl in lists):
+            return NucleiList(nuclei)
+        # Features are already tabulated per list (in the workers, when
+        # parallelized), so only the columns need to be stacked.
+        return NucleiList(
+            nuclei, pd.concat([nl.__data for nl in lists], ignore_index=True)
+        )
 
     def __len__(self):
         return len(self.__nuclei)
 
+    @staticmethod
+    def __tabulate(nuclei: List[Nucleus]) -> pd.DataFrame:
+        channels = list(set(itertools.chain(*[n.channel_names for n in nuclei])))
+        columns: Dict[str, List[Any]] = dict(image=[], label=[], size=[])
+        isum_columns = [columns.setdefault(f"isum_{c}", []) for c in channels]
+        for n in nuclei:
+            columns["image"].append(n.source)
+            columns["label"].append(n.idx)
+            columns["size"].append(n.total_size)
+            for channel, isum_column in zip(channels, isum_columns):
+                isum_column.append(n.get_intensity_sum(channel))
+        return pd.DataFrame.from_dict(columns)
+
     def get_data(self):
-        ndata = pd.DataFrame.from_dict(
-            dict(
-                image=[n.source for n in self.nuclei],
-                label=[n.idx for n in self.nuclei],
-                size=[n.total_size for n in self.nuclei],
-            )
-        )
-        channels = list(set(itertools.chain(*[n.channel_names for n in self.nuclei])))
-        for channel in channels:
-            ndata[f"isum_{channel}"] = [
-                n.get_intensity_sum(channel) for n in self.nuclei
-            ]
-        return ndata
+        if self.__data is None:
+            self.__data = NucleiList.__tabulate(self.__nuclei)
+        return self.__data.copy()
 
     def select_G1(
         self, k_sigma: float = 2.5, channel: str = "unknown"
@@ -327,13 +363,16 @@ class ParticleFinder(object):
     ) -> List[Any]:
         assert L.pixels.min() != L.pixels.max(), "monochromatic image detected."
 
+        labeled_pixels = L.pixels
         boxed_particles: List[Particle] = []
-        for particle_label in np.unique(L.pixels):
-            if 0 == particle_label:
+        for particle_label, bounds in enumerate(
+            ndi.find_objects(labeled_pixels), start=1
+        ):
+            if bounds is None:
                 continue
-            binary_pixels = L.pixels == particle_label
-            roi = BoundingElement.from_binary_pixels(binary_pixels)
-            particle = particleClass(roi.apply_to_pixels(binary_pixels), roi, L.axes)
+            roi = BoundingElement.from_slices(bounds)
+            binary_pixels = labeled_pixels[roi.bounds] == particle_label
+            particle = particleClass(binary_pixels, roi, L.axes)
             particle.aspect = L.aspect
             particle.idx = particle_label
             boxed_particles.append(particle)
@@ -7,10 +7,11 @@ import logging
 import os
 from radiantkit import string
 import re
-from typing import List, Optional, Pattern, Tuple
+from typing import Dict, List, Optional, Pattern, Set, Tuple
 
 
 FileList = List[str]
+DirEntries = Dict[str, os.DirEntry]
 RawMaskPair = Tuple[str, str]
 
 
@@ -28,11 +29,21 @@ def add_extension(path: str, ext: str, delim: str = ".") -> str:
     return path
 
 
-def find_re(ipath: str, ireg: Pattern) -> FileList:
+def scan_directory(ipath: str) -> DirEntries:
+    with os.scandir(ipath) as entries:
+        return {entry.name: entry for entry in entries}
+
+
+def find_re(
+    ipath: str, ireg: Pattern, entries: Optional[DirEntries] = None
+) -> FileList:
+    if entries is None:
+        entries = scan_directory(ipath)
+    pattern = re.compile(ireg)
     flist = [
-        f
-        for f in os.listdir(ipath)
-        if (os.path.isfile(os.path.join(ipath, f)) and re.match(ireg, f) is not None)
+        name
+        for name, entry in entries.items()
+        if (entry.is_file() and pattern.match(name) is not None)
     ]
     return flist
 
@@ -40,32 +51,39 @@ def find_re(ipath: str, ireg: Pattern) -> FileList:
 def select_by_prefix_and_suffix(
     dpath: str, ilist: FileList, prefix: str = "", suffix: str = ""
 ) -> Tuple[FileList, FileList]:
-    olist = ilist.copy()
-    if 0 != len(suffix):
-        olist = [f for f in olist if os.path.splitext(f)[0].endswith(suffix)]
-    if 0 != len(prefix):
-        olist = [f for f in olist if os.path.splitext(f)[0].startswith(prefix)]
-    return (olist, [x for x in ilist if x not in olist])
+    olist: FileList = []
+    others: FileList = []
+    for f in ilist:
+        fbase = os.path.splitext(f)[0]
+        if fbase.endswith(suffix) and fbase.startswith(prefix):
+            olist.append(f)
+        else:
+            others.append(f)
+    return (olist, others)
 
 
 def pair_raw_mask_images(
     dpath: str, flist: List[str], prefix: str = "", suffix: str = ""
 ) -> List[RawMaskPair]:
     olist: List[RawMaskPair] = []
+    skipped: Set[str] = set()
     for fpath in flist:
         fbase, fext = os.path.splitext(fpath)
-        fbase = fbase[slice(len(prefix), len(fbase) - len(suffix) + 1)]
+        fbase = fbase[slice(len(prefix), len(fbase) - len(suffix))]
         raw_image = f"{fbase}{fext}"
         if not os.path.isfile(os.path.join(dpath, raw_image)):
             logging.warning(f"missing raw image for mask '{fpath}', skipped.")
-            flist.pop(flist.index(fpath))
+            skipped.add(fpath)
         else:
             olist.append((raw_image, fpath))
+    if 0 != len(skipped):
+        flist[:] = [fpath for fpath in flist if fpath not in skipped]
+    olist.sort()
     return olist
 
 
 def get_image_details(path: str, inreg: Pattern) -> Optional[Tuple[int, str]]:
-    fmatch = re.match(inreg, os.path.basename(path))
+    fmatch = re.compile(inreg).match(os.path.basename(path))
     if fmatch is not None:
         finfo = fmatch.groupdict()
         return (int(finfo["series_id"]), finfo["channel_name"])
@@ -4,6 +4,7 @@
 """
 
 import argparse
+from joblib import delayed, Parallel  # type: ignore
 import logging
 import numpy as np  # type: ignore
 import os
@@ -18,7 +19,7 @@ from radiantkit.string import TIFFNameTemplate as TNTemplate
 import re
 from rich.progress import track  # type: ignore
 import sys
-from typing import Iterable, List, Tuple, Union
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
 
 @enable_rich_exceptions
@@ -115,6 +116,18 @@ quotes, i.e., "\\$". Alternatively, use single quotes, i.e., '$'.""",
         help="""Write compressed TIFF as output. Useful especially for binary or
         low-depth (e.g. labeled) images.""",
     )
+    advanced = ap.add_compression_level_argument(advanced)
+    advanced.add_argument(
+        "--memmap",
+        metavar="DIRPATH",
+        type=str,
+        nargs="?",
+        const="",
+        default=None,
+        help="""Decode the czi file into a temporary memory-mapped file instead of
+        RAM. Useful for files larger than the available memory. Optionally,
+        specify the folder where the temporary file is created.""",
+    )
     advanced.add_argument(
         "-i",
         "--info",
@@ -133,6 +146,7 @@ quotes, i.e., "\\$". Alternatively, use single quotes, i.e., '$'.""",
         default=False,
         help="List input nd2 files and stop (nothing is converted).",
     )
+    advanced = ap.add_threads_argument(advanced)
 
     parser = ap.add_version_argument(parser)
     parser.set_defaults(parse=parse_arguments, run=run)
@@ -150,6 +164,10 @@ def parse_arguments(args: argparse.Namespace) -> argparse.Namespace:
 
     assert 0 != len(args.template)
     args.template = TNTemplate(args.template)
+    args.inreg = re.compile(args.inreg)
+    args.compression_level = ap.check_compression_level(args.compression_level)
+
+    args.threads = ap.check_threads(args.threads)
 
     return args
 
@@ -167,8 +185,8 @@ def check_channels(channels: List[str], czi_image: CziFile2) -> List[str]:
 
 
 def field_generator(
-    args: argparse.Namespace, czi_image: CziFile2
-) -> Iterable[Tuple[np.ndarray, str]]:
+    args: argparse.Namespace, czi_image: CziFile2, channel_ids: FrozenSet[int]
+) -> Iterable[Tuple[np.ndarray, int, str]]:
     for field_id in args.fields:
         if field_id - 1 >= czi_image.field_count():
             logging.warning(
@@ -183,10 +201,11 @@ def field_generator(
             continue
         for yieldedValue in czi_image.get_channel_pixels(args, field_id - 1):
             channel_pixels, channel_id = yieldedValue
-            if not list(czi_image.get_channel_names())[channel_id] in args.channels:
+            if channel_id not in channel_ids:
                 continue
             yield (
                 channel_pixels,
+                channel_id,
                 czi_image.get_tiff_path(args.template, channel_id, field_id - 1),
             )
 
@@ -202,20 +221,60 @@ def convert_to_tiff(args: argparse.Namespace, outdir: str, czi_image: CziFile2)
     export_total = min(
         czi_image.field_count() * czi_image.channel_count(), export_total
     )
-    for (OI, opath) in track(field_generator(args, czi_image), total=int(export_total)):
-        imt.save_tiff(
-            os.path.join(outdir, opath),
-            OI.astype(imt.get_dtype(int(OI.max()))),
-            args.doCompress,
-            resolution=(
-                1e-6 / czi_image.get_axis_resolution("X"),
-                1e-6 / czi_image.get_axis_resolution("Y"),
-            ),
-            inMicrons=True,
-            z_resolution=czi_image.get_axis_resolution("Z") * 1e6,
+    resolution = czi_image.get_resolution()
+    channel_ids = czi_image.select_channel_ids(args.channels)
+    bit_depths = {
+        channel_id: czi_image.get_bit_depth(channel_id) for channel_id in channel_ids
+    }
+
+    if 1 == args.threads:
+        for (OI, channel_id, opath) in track(
+            field_generator(args, czi_image, channel_ids), total=int(export_total)
+        ):
+            export_channel(
+                args,
+                os.path.join(outdir, opath),
+                OI,
+                resolution,
+                bit_depths[channel_id],
+            )
+    else:
+        # Pixels are decoded once and shared; tiff encoding/writing releases
+        # the GIL, so threads avoid copying fields into worker processes.
+        Parallel(n_jobs=args.threads, prefer="threads", verbose=11)(
+            delayed(export_channel)(
+                args,
+                os.path.join(outdir, opath),
+                OI,
+                resolution,
+                bit_depths[channel_id],
+            )
+            for (OI, channel_id, opath) in field_generator(args, czi_image, channel_ids)
         )
 
 
+def export_channel(
+    args: argparse.Namespace,
+    opath: str,
+    OI: np.ndarray,
+    resolution: Dict[str, float],
+    bit_depth: Optional[int] = None,
+) -> None:
+    if bit_depth is None:
+        dtype = imt.get_dtype(int(OI.max()))
+    else:
+        dtype = imt.get_dtype_from_bits(bit_depth)
+    imt.save_tiff(
+        opath,
+        OI.astype(dtype, copy=False),
+        args.doCompress,
+        resolution=(1e-6 / resolution["X"], 1e-6 / resolution["Y"]),
+        inMicrons=True,
+        z_resolution=resolution["Z"] * 1e6,
+        compression_level=args.compression_level,
+    )
+
+
 def check_argument_compatibility(
     args: argparse.Namespace, czi_image: CziFile2
 ) -> argparse.Namespace:
@@ -248,13 +307,18 @@ def check_argument_compatibility(
     return args
 
 
+def get_decoding_output(memmap: Optional[str]) -> Optional[str]:
+    if memmap is None:
+        return None
+    return "memmap" if 0 == len(memmap) else f"memmap:{memmap}"
+
+
 def mk_outdir(outdir: Union[str, None], path: str) -> str:
     if outdir is None:
         outdir = os.path.splitext(os.path.basename(path))[0]
         outdir = os.path.join(os.path.dirname(path), outdir)
     assert not os.path.isfile(outdir), f"output directory cannot be a file: {outdir}"
-    if not os.path.isdir(outdir):
-        os.mkdir(outdir)
+    os.makedirs(outdir, exist_ok=True)
     return outdir
 
 
@@ -264,11 +328,11 @@ def convert_single_czi_file(args: argparse.Namespace, path: str, outdir: str = N
     if args.list:
         return
 
-    czi_image = CziFile2(path)
+    czi_image = CziFile2(path, get_decoding_output(args.memmap))
     if args.info:
         czi_image.log_details()
         logging.info("")
-        sys.exit()
+        return
 
     outdir = mk_outdir(outdir, path)
     add_log_file_handler(os.path.join(outdir, "czi_to_tiff.log.txt"))
@@ -293,7 +357,7 @@ def convert_single_czi_file(args: argparse.Namespace, path: str, outdir: str = N
 def convert_folder_czi_files(args: argparse.Namespace, path: str):
     assert os.path.isdir(path)
     for fpath in sorted(os.listdir(path)):
-        if re.match(args.inreg, fpath) is not None:
+        if args.inreg.match(fpath) is not None:
             fpath = os.path.join(path, fpath)
             convert_single_czi_file(args, fpath)
 
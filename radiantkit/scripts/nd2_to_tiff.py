@@ -17,10 +17,12 @@ import radiantkit.stat as stat
 from radiantkit.string import MultiRange
 from radiantkit.string import TIFFNameTemplateFields as TNTFields
 from radiantkit.string import TIFFNameTemplate as TNTemplate
+import queue
 import re
 from rich.progress import track  # type: ignore
 import sys
-from typing import List, Optional, Tuple, Union
+import threading
+from typing import FrozenSet, Iterable, List, Tuple, Union
 
 
 @enable_rich_exceptions
@@ -135,6 +137,7 @@ quotes, i.e., "\\$". Alternatively, use single quotes, i.e., '$'.""",
         help="""Write compressed TIFF as output. Useful especially for binary or
         low-depth (e.g. labeled) images.""",
     )
+    advanced = ap.add_compression_level_argument(advanced)
     advanced.add_argument(
         "-i",
         "--info",
@@ -170,6 +173,8 @@ def parse_arguments(args: argparse.Namespace) -> argparse.Namespace:
 
     assert 0 != len(args.template)
     args.template = TNTemplate(args.template)
+    args.inreg = re.compile(args.inreg)
+    args.compression_level = ap.check_compression_level(args.compression_level)
 
     return args
 
@@ -214,9 +219,32 @@ def get_resolution_Z(nd2_image: ND2Reader2, field_id: int, enforce: float) -> fl
     return z_steps[0]
 
 
-def get_field(nd2_image: ND2Reader2, field_id: int, channel_id: int) -> np.ndarray:
+def read_fields_ahead(
+    nd2_image: ND2Reader2, field_ids: List[int], depth: int = 1
+) -> Iterable[Tuple[int, Union[pims.frame.Frame, Exception]]]:
+    # Reads the next field(s) on a separate thread while the current one is
+    # being encoded and written. Read errors are handed over with the field.
+    fields: queue.Queue = queue.Queue(maxsize=depth)
+
+    def read_fields() -> None:
+        for field_id in field_ids:
+            try:
+                fields.put((field_id, nd2_image[field_id]))
+            except Exception as e:
+                fields.put((field_id, e))
+        fields.put(None)
+
+    threading.Thread(target=read_fields, daemon=True).start()
+    field = fields.get()
+    while field is not None:
+        yield field
+        field = fields.get()
+
+
+def get_field(
+    nd2_image: ND2Reader2, field_of_view: pims.frame.Frame, channel_id: int
+) -> np.ndarray:
     slicing: List[Union[slice, int]] = []
-    field_of_view = nd2_image[field_id]
     for a in nd2_image.bundle_axes:
         axis_size = field_of_view.shape[nd2_image.bundle_axes.index(a)]
         if "c" == a:
@@ -252,51 +280,52 @@ def export_multiple_channels(
     outdir: str,
     nd2_image: ND2Reader2,
     field_id: int,
+    field_of_view: pims.frame.Frame,
     args,
-    channels: Optional[List[str]] = None,
+    channel_ids: FrozenSet[int],
     z_resolution: float = 0.0,
 ) -> None:
-    channels = list(nd2_image.get_channel_names()) if channels is None else channels
-    channels = nd2_image.select_channels(channels)
     bundle_axes = nd2_image.bundle_axes.copy()
     if nd2_image.has_multi_channels():
         bundle_axes.pop(bundle_axes.index("c"))
     bundle_axes = "".join(bundle_axes).upper()
-    for channel_id in range(nd2_image.channel_count()):
-        channel_name = nd2_image.metadata["channels"][channel_id].lower()
-        if channel_name in channels:
-            imt.save_tiff(
-                os.path.join(
-                    outdir,
-                    nd2_image.get_tiff_path(args.template, channel_id, field_id),
-                ),
-                get_field(nd2_image, field_id, channel_id),
-                args.doCompress,
-                bundle_axes=bundle_axes,
-                inMicrons=True,
-                z_resolution=z_resolution,
-                resolution=(
-                    0 if 0 == nd2_image.xy_resolution else 1 / nd2_image.xy_resolution,
-                    0 if 0 == nd2_image.xy_resolution else 1 / nd2_image.xy_resolution,
-                    None,
-                ),
-            )
+    for channel_id in sorted(channel_ids):
+        imt.save_tiff(
+            os.path.join(
+                outdir,
+                nd2_image.get_tiff_path(args.template, channel_id, field_id),
+            ),
+            get_field(nd2_image, field_of_view, channel_id),
+            args.doCompress,
+            bundle_axes=bundle_axes,
+            inMicrons=True,
+            z_resolution=z_resolution,
+            resolution=(
+                0 if 0 == nd2_image.xy_resolution else 1 / nd2_image.xy_resolution,
+                0 if 0 == nd2_image.xy_resolution else 1 / nd2_image.xy_resolution,
+                None,
+            ),
+            compression_level=args.compression_level,
+        )
 
 
 def export_field(
     outdir: str,
     nd2_image: ND2Reader2,
     field_id: int,
+    field_of_view: Union[pims.frame.Frame, Exception],
     args: argparse.Namespace,
-    channels: Optional[List[str]] = None,
+    channel_ids: FrozenSet[int],
 ) -> None:
     z_resolution = get_resolution_Z(nd2_image, field_id, args.deltaZ)
     if np.isnan(z_resolution):
         return
 
     try:
+        if isinstance(field_of_view, Exception):
+            raise field_of_view
         export_multiple_channels(
-            outdir, nd2_image, field_id, args, channels, z_resolution
+            outdir, nd2_image, field_id, field_of_view, args, channel_ids, z_resolution
         )
     except ValueError as e:
         if "could not broadcast input array from shape" in e.args[0]:
@@ -328,9 +357,9 @@ def convert_to_tiff(
         field_list = args.fields
     else:
         field_list = range(1, nd2_image.field_count() + 1)
-    field_generator = track(field_list, description="Converting field")
 
-    for field_id in field_generator:
+    field_ids: List[int] = []
+    for field_id in field_list:
         if field_id - 1 >= nd2_image.field_count():
             logging.warning(
                 "".join(
@@ -341,7 +370,15 @@ def convert_to_tiff(
                 )
             )
         else:
-            export_field(outdir, nd2_image, field_id - 1, args, args.channels)
+            field_ids.append(field_id - 1)
+
+    channel_ids = nd2_image.select_channel_ids(args.channels)
+    for field_id, field_of_view in track(
+        read_fields_ahead(nd2_image, field_ids),
+        description="Converting field",
+        total=len(field_ids),
+    ):
+        export_field(outdir, nd2_image, field_id, field_of_view, args, channel_ids)
 
 
 def check_channel_selection(args: argparse.Namespace, nd2_image: ND2Reader2):
@@ -424,8 +461,7 @@ def convert_single_nd2_file(args: argparse.Namespace, path: str, outdir: str = N
         logging.info("")
         return
 
-    if not os.path.isdir(outdir):
-        os.mkdir(outdir)
+    os.makedirs(outdir, exist_ok=True)
     add_log_file_handler(os.path.join(outdir, "nd2_to_tiff.log.txt"))
 
     nd2_image.log_details()
@@ -439,7 +475,7 @@ def convert_single_nd2_file(args: argparse.Namespace, path: str, outdir: str = N
 def convert_folder_nd2_files(args: argparse.Namespace, path: str):
     assert os.path.isdir(path)
     for fpath in sorted(os.listdir(path)):
-        if re.match(args.inreg, fpath) is not None:
+        if args.inreg.match(fpath) is not None:
             fpath = os.path.join(path, fpath)
             convert_single_nd2_file(args, fpath)
 
@@ -248,17 +248,14 @@ def extract_passing_nuclei_per_images(
     ndata: pd.DataFrame, inreg: Pattern
 ) -> Dict[int, List[int]]:
     passed = ndata.loc[ndata["pass"], ["image", "label"]]
-    passed["images_id"] = np.nan
-    for ii in passed.index:
-        image_details = path.get_image_details(passed.loc[ii, "image"], inreg)
+    images_id: Dict[str, int] = {}
+    for image in passed["image"].unique():
+        image_details = path.get_image_details(image, inreg)
         assert image_details is not None
-        passed.loc[ii, "images_id"] = image_details[0]
-    passed.drop("image", 1, inplace=True)
+        images_id[image] = image_details[0]
     passed_dict: DefaultDict[int, List[int]] = defaultdict(lambda: [])
-    for sid in set(passed["images_id"].values):
-        passed_dict[sid] = passed.loc[
-            passed["images_id"] == sid, "label"
-        ].values.tolist()
+    for sid, labels in passed.groupby(passed["image"].map(images_id))["label"]:
+        passed_dict[sid] = labels.tolist()
     return passed_dict
 
 
@@ -336,14 +333,11 @@ def run(args: argparse.Namespace) -> None:
         args, images_list, passed, nuclei
     )
 
-    np.set_printoptions(formatter={"float_kind": "{:.2E}".format})
-    logging.info(f"size fit:\n{details['size']['fit']}")
-    np.set_printoptions(formatter={"float_kind": "{:.2E}".format})
-    logging.info(f"size range: {details['size']['range']}")
-    np.set_printoptions(formatter={"float_kind": "{:.2E}".format})
-    logging.info(f"intensity sum fit:\n{details['isum']['fit']}")
-    np.set_printoptions(formatter={"float_kind": "{:.2E}".format})
-    logging.info(f"intensity sum range: {details['isum']['range']}")
+    with np.printoptions(formatter={"float_kind": "{:.2E}".format}):
+        logging.info(f"size fit:\n{details['size']['fit']}")
+        logging.info(f"size range: {details['size']['range']}")
+        logging.info(f"intensity sum fit:\n{details['isum']['fit']}")
+        logging.info(f"intensity sum range: {details['isum']['range']}")
 
     tsv_path = os.path.join(args.input, __OUTPUT__["raw_data"])
     logging.info(f"writing nuclear data to:\n{tsv_path}")
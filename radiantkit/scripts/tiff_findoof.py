@@ -12,6 +12,7 @@ import pandas as pd  # type: ignore
 from plotly import graph_objects as go, express as px  # type: ignore
 from radiantkit import argtools
 from radiantkit import const, exception, image, io, path, report
+import re
 from typing import Any, DefaultDict, Dict, Optional
 
 
@@ -78,6 +79,7 @@ def parse_arguments(args: argparse.Namespace) -> argparse.Namespace:
     if args.output is None:
         args.output = os.path.join(args.input, "oof.tsv")
     args.threads = argtools.check_threads(args.threads)
+    args.inreg = re.compile(args.inreg)
     args.descriptor_mode = (
         image.SliceDescriptorMode.INTENSITY_SUM
         if args.intensity_sum
@@ -87,7 +89,7 @@ def parse_arguments(args: argparse.Namespace) -> argparse.Namespace:
 
 
 def check_focus(args: argparse.Namespace, ipath: str) -> pd.DataFrame:
-    img = image.ImageGrayScale.from_tiff(os.path.join(args.input, ipath))
+    img = image.ImageGrayScale.from_tiff(os.path.join(args.input, ipath), mmap=True)
     is_in_focus, profile_data = img.is_in_focus(args.descriptor_mode, args.fraction)
     profile_data["path"] = ipath
     profile_data["response"] = "in-focus" if is_in_focus else "out-of-focus"
@@ -109,7 +111,7 @@ def run(args: argparse.Namespace) -> None:
     logging.info(f"Fraction:\t{args.fraction}")
     logging.info(f"Rename:\t\t{args.rename}")
     logging.info(f"Mode:\t\t{args.descriptor_mode.value}")
-    logging.info(f"Regexp:\t\t{args.inreg}")
+    logging.info(f"Regexp:\t\t{args.inreg.pattern}")
     logging.info(f"Threads:\t{args.threads}")
 
     series_data = Parallel(n_jobs=args.threads, verbose=11)(
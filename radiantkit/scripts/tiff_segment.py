@@ -3,11 +3,13 @@
 @contact: gigi.ga90@gmail.com
 """
 
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
 import argparse
 from joblib import cpu_count, delayed, Parallel  # type: ignore
 import numpy as np  # type: ignore
 import os
+import queue
 import radiantkit as ra
 from radiantkit import argtools as ap
 from radiantkit import const, path, stat, string
@@ -18,7 +20,8 @@ import re
 from rich.progress import track  # type: ignore
 from rich.prompt import Confirm  # type: ignore
 import skimage as ski  # type: ignore
-from typing import List, Optional, Tuple
+import threading
+from typing import Iterable, List, Optional, Tuple, Union
 
 
 @enable_rich_exceptions
@@ -31,7 +34,7 @@ optimized for nuclear DNA staining and voxel size of 0.13x0.13x0.3 uM.
 
 The input images are first identified based on a regular expression matched to
 the file name. Then, they are re-scaled (if deconvolved with Huygens software).
-Afterwards, a global (Otsu) and local (gaussian) thresholds are applied to
+Afterwards, a global (Otsu) and local (mean) thresholds are applied to
 binarize the image in 3D. Finally, holes are filled in 3D and closed to remove
 small objects. Finally. objects are filtered based on volume and Z size.
 Moreover, objects touching the XY image borders are discarded.
@@ -323,12 +326,10 @@ def read_mask_2d(
 ) -> Optional[image.ImageLabeled]:
     mask2d = None
     if args.mask_2d is not None:
-        if os.path.isdir(args.manual_2d_masks):
-            mask2d_path = os.path.join(args.manual_2d_masks, os.path.basename(imgpath))
-            if os.path.isfile(mask2d_path):
-                mask2d = image.ImageLabeled.from_tiff(
-                    mask2d_path, axes="YX", doRelabel=False
-                )
+        mask2d_path = os.path.join(args.mask_2d, os.path.basename(imgpath))
+        if os.path.isfile(mask2d_path):
+            # Uncompressed masks stay memory-mapped, they are only ever read.
+            mask2d = image.ImageLabeled.from_tiff(mask2d_path, doRelabel=False)
     return mask2d
 
 
@@ -420,17 +421,43 @@ def run_binarizer(
     return L
 
 
-def segment(
-    args: argparse.Namespace, imgpath: str, imgdir: str, loglevel: str = "INFO"
-) -> None:
-    logging.getLogger().setLevel(loglevel)
-    logging.info(f"Segmenting image '{imgpath}'")
-
+def read_image(
+    args: argparse.Namespace, imgpath: str, imgdir: str
+) -> channel.ImageGrayScale:
     img = channel.ImageGrayScale.from_tiff(
         os.path.join(imgdir, imgpath),
         do_rescale=args.do_rescaling,
         default_axes=args.default_axes,
     )
+    return img
+
+
+def read_images_ahead(
+    args: argparse.Namespace, imglist: List[str], imgdir: str, depth: int = 1
+) -> Iterable[Tuple[str, Union[channel.ImageGrayScale, Exception]]]:
+    # Reads (and decodes) the next image(s) on a separate thread while the
+    # current one is being segmented. Read errors are handed over with the path.
+    images: queue.Queue = queue.Queue(maxsize=depth)
+
+    def read_images() -> None:
+        for imgpath in imglist:
+            try:
+                images.put((imgpath, read_image(args, imgpath, imgdir)))
+            except Exception as e:
+                images.put((imgpath, e))
+        images.put(None)
+
+    threading.Thread(target=read_images, daemon=True).start()
+    item = images.get()
+    while item is not None:
+        yield item
+        item = images.get()
+
+
+def segment_image(
+    args: argparse.Namespace, imgpath: str, img: channel.ImageGrayScale
+) -> Optional[channel.ImageLabeled]:
+    logging.info(f"Segmenting image '{imgpath}'")
     logging.info(f"image axes: {img.axes}")
     logging.info(f"image shape: {img.shape}")
     if args.do_rescaling:
@@ -440,12 +467,17 @@ def segment(
 
     if 0 == L.pixels.max():
         logging.warning(f"skipped image '{imgpath}' (only background)")
-        return
+        return None
+    return L
 
+
+def write_output(
+    args: argparse.Namespace, imgpath: str, L: channel.ImageLabeled
+) -> None:
     imgbase, imgext = os.path.splitext(imgpath)
     if not args.labeled:
         logging.info("writing output")
-        M = image.ImageBinary(L.pixels)
+        M = image.ImageBinary(L.pixels > 0, doRebinarize=False)
         M.to_tiff(
             os.path.join(
                 args.output, f"{args.outprefix}{imgbase}{args.outsuffix}{imgext}"
@@ -462,12 +494,41 @@ def segment(
         )
 
 
+def segment(
+    args: argparse.Namespace, imgpath: str, imgdir: str, loglevel: str = "INFO"
+) -> None:
+    logging.getLogger().setLevel(loglevel)
+    L = segment_image(args, imgpath, read_image(args, imgpath, imgdir))
+    if L is not None:
+        write_output(args, imgpath, L)
+
+
+def segment_serially(args: argparse.Namespace, imglist: List[str]) -> None:
+    # Overlaps reading the next image and writing the previous mask with the
+    # segmentation of the current one. At most one write is pending.
+    pending_write: Optional[Future] = None
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        for imgpath, img in track(
+            read_images_ahead(args, imglist, args.input), total=len(imglist)
+        ):
+            if isinstance(img, Exception):
+                raise img
+            L = segment_image(args, imgpath, img)
+            if pending_write is not None:
+                pending_write.result()
+                pending_write = None
+            if L is not None:
+                pending_write = writer.submit(write_output, args, imgpath, L)
+        if pending_write is not None:
+            pending_write.result()
+
+
 @enable_rich_exceptions
 def run(args: argparse.Namespace) -> None:
     confirm_arguments(args)
     if os.path.isfile(args.input):
-        assert re.match(
-            args.inreg, os.path.basename(args.input)
+        assert (
+            args.inreg.match(os.path.basename(args.input)) is not None
         ), "the provided image name does not match the pattern"
         imglist = [os.path.basename(args.input)]
         args.input = os.path.dirname(args.input)
@@ -485,10 +546,12 @@ def run(args: argparse.Namespace) -> None:
     logLevel = 50 if args.silent else logLevel
 
     logging.info(f"found {len(imglist)} image(s) to segment.")
-    if 1 == args.threads:
-        for imgpath in track(imglist):
-            segment(args, imgpath, args.input)
+    threads = min(args.threads, len(imglist))
+    if 1 >= threads:
+        segment_serially(args, imglist)
     else:
-        Parallel(n_jobs=args.threads, verbose=11)(
+        # One task per image, so joblib hands the next image to whichever
+        # worker frees up first, even when stack sizes differ a lot.
+        Parallel(n_jobs=threads, verbose=11)(
             delayed(segment)(args, imgpath, args.input, logLevel) for imgpath in imglist
         )
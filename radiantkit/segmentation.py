@@ -3,24 +3,29 @@
 @contact: gigi.ga90@gmail.com
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from logging import Logger
+import numpy as np  # type: ignore
 from radiantkit import const
 from radiantkit.channel import ImageGrayScale
-from radiantkit.image import ImageBinary, ImageLabeled
-from skimage.filters import threshold_otsu  # type: ignore
-from typing import Optional, Union
+from radiantkit.image import ImageBinary, ImageLabeled, closing2, threshold_adaptive
+from radiantkit.image import get_kept_labels, get_XY_borders, get_Z_borders
+from typing import Callable, List, Optional, Tuple, Union
 
 
 class BinarizerSettings(object):
     segmentation_type: const.SegmentationType = const.SegmentationType.get_default()
     do_global: bool = True
     global_closing: bool = True
+    global_sampling_step: int = 4
     do_local: bool = True
-    _local_side: int = 101
-    local_method: str = "gaussian"
+    _local_side: Union[int, Tuple[int, ...]] = 101
+    local_method: str = "mean"
     local_mode: str = "constant"
     local_closing: bool = True
+    closing_side: int = 3
+    chunk_size: int = const.default_chunk_size
     do_clear_XY_borders: bool = True
     do_clear_Z_borders: bool = False
     do_fill_holes: bool = True
@@ -31,13 +36,16 @@ class BinarizerSettings(object):
         self.logger = logger
 
     @property
-    def local_side(self) -> int:
+    def local_side(self) -> Union[int, Tuple[int, ...]]:
         return self._local_side
 
     @local_side.setter
-    def local_side(self, value: int) -> None:
-        if 0 == value % 2:
-            value += 1
+    def local_side(self, value: Union[int, Tuple[int, ...]]) -> None:
+        if isinstance(value, int):
+            if 0 == value % 2:
+                value += 1
+        else:
+            value = tuple(side + 1 if 0 == side % 2 else side for side in value)
         self._local_side = value
 
 
@@ -45,70 +53,110 @@ class Binarizer(BinarizerSettings):
     def __init__(self, logger: Logger = logging.getLogger("radiantkit")):
         super(Binarizer, self).__init__(logger)
 
-    def __do_global_threshold(self, img: ImageGrayScale) -> ImageBinary:
-        global_threshold = threshold_otsu(img.pixels)
-        self.logger.info(f"applying global threshold of {global_threshold}")
-        gmask = img.threshold_global(global_threshold)
+    def __do_global_threshold(self, pixels: np.ndarray, threshold: float) -> np.ndarray:
+        gmask = pixels > threshold
 
-        if self.global_closing:
-            gmask.close()
+        if self.global_closing and gmask.any():
+            gmask = closing2(gmask, self.closing_side)
 
         return gmask
 
-    def __do_local_threshold(self, img: ImageGrayScale) -> ImageBinary:
-        self.logger.info(
-            "".join(
-                [
-                    "applying adaptive threshold to neighbourhood ",
-                    f"with side of {self.local_side} px. ",
-                    f"({self.local_method}, {self.local_mode})",
-                ]
-            )
-        )
-        local_mask = img.threshold_adaptive(
-            self.local_side, self.local_method, self.local_mode
+    def __do_local_threshold(self, pixels: np.ndarray) -> np.ndarray:
+        local_mask = threshold_adaptive(
+            pixels, self.local_side, self.local_method, self.local_mode
         )
 
-        if self.local_closing:
-            local_mask.close()
+        if self.local_closing and local_mask.any():
+            local_mask = closing2(local_mask, self.closing_side)
 
         return local_mask
 
-    def __combine_global_and_local_thresholds(self, img: ImageGrayScale) -> ImageBinary:
-        mask_list = []
-
-        if self.do_global:
-            mask_list.append(self.__do_global_threshold(img))
+    def __get_chunk_halo(self) -> int:
+        # Planes needed on each side of a Z chunk for its thresholds and
+        # closings to match those computed on the whole stack.
+        halo = 2 * (self.closing_side // 2)
+        if isinstance(self.local_side, tuple) and 3 == len(self.local_side):
+            halo += self.local_side[0] // 2
+        return halo
 
-        if self.do_local and 1 < self.local_side:
-            mask_list.append(self.__do_local_threshold(img))
+    def __combine_masks(
+        self,
+        img: ImageGrayScale,
+        M2: Optional[Union[ImageBinary, ImageLabeled]] = None,
+    ) -> ImageBinary:
+        threshold_steps: List[Callable[[np.ndarray], np.ndarray]] = []
 
-        while 1 < len(mask_list):
-            mask_list[0].logical_and(mask_list[1])
-            mask_list.pop(1)
+        if self.do_global:
+            # Otsu only needs the intensity histogram, a strided subsample is enough
+            global_threshold = img.get_otsu_threshold(self.global_sampling_step)
+            self.logger.info(f"applying global threshold of {global_threshold}")
+            threshold_steps.append(
+                lambda pixels: self.__do_global_threshold(pixels, global_threshold)
+            )
 
-        return mask_list[0]
+        if self.do_local and 1 < np.max(self.local_side):
+            self.logger.info(
+                "".join(
+                    [
+                        "applying adaptive threshold to neighbourhood ",
+                        f"with side of {self.local_side} px. ",
+                        f"({self.local_method}, {self.local_mode})",
+                    ]
+                )
+            )
+            threshold_steps.append(self.__do_local_threshold)
 
-    def __combine_with_2d_mask(
-        self, M: ImageBinary, M2: Optional[Union[ImageBinary, ImageLabeled]]
-    ) -> ImageBinary:
+        foreground2d = None
         if M2 is not None:
             logging.info("combining with 2D mask")
-            M.logical_and(ImageBinary(M2.pixels, axes=M2.axes))
-        return M
+            foreground2d = M2.pixels > 0
+
+        # Stacks are processed in Z chunks with a halo, so only one chunk of
+        # rescaled pixels and partial masks is alive next to the final mask.
+        if 3 == len(img.shape):
+            chunk_size, halo = self.chunk_size, self.__get_chunk_halo()
+        else:
+            chunk_size, halo = img.shape[0], 0
+
+        combined = np.empty(img.shape, dtype=bool)
+        # Global and local masks are independent, and ndimage filters release
+        # the GIL, so they are thresholded and closed side by side.
+        with ThreadPoolExecutor(max_workers=max(1, len(threshold_steps))) as pool:
+            for start in range(0, img.shape[0], chunk_size):
+                stop = min(start + chunk_size, img.shape[0])
+                chunk_start = max(0, start - halo)
+                pixels = img.crop((slice(chunk_start, min(img.shape[0], stop + halo)),))
+                mask_list = list(pool.map(lambda step: step(pixels), threshold_steps))
+
+                core = combined[start:stop]
+                core_bounds = slice(start - chunk_start, stop - chunk_start)
+                np.copyto(core, mask_list[0][core_bounds])
+                for mask in mask_list[1:]:
+                    np.logical_and(core, mask[core_bounds], out=core)
+                if foreground2d is not None:
+                    np.logical_and(core, foreground2d, out=core)
+
+        return ImageBinary(combined, axes=img.axes, doRebinarize=False)
 
     def __clear_borders(self, M: ImageBinary) -> ImageBinary:
+        if not self.do_clear_XY_borders and not self.do_clear_Z_borders:
+            return M
+
         L = ImageLabeled(M.pixels, axes=M.axes)
+        borders = []
 
         if self.do_clear_XY_borders:
             logging.info("clearing XY borders")
-            L.clear_XY_borders()
+            borders.extend(get_XY_borders(L.pixels))
 
         if self.do_clear_Z_borders:
             logging.info("clearing Z borders")
-            L.clear_Z_borders()
+            borders.extend(get_Z_borders(L.pixels))
 
-        return ImageBinary(L.pixels, axes=L.axes)
+        # A single lookup drops every border label and binarizes the result.
+        keep = get_kept_labels(L.pixels, *borders)
+        keep[0] = False
+        return ImageBinary(keep[L.pixels], axes=L.axes, doRebinarize=False)
 
     def run(
         self,
@@ -126,8 +174,7 @@ class Binarizer(BinarizerSettings):
             self.logger.info(f"projecting over Z [{self.segmentation_type}].")
             img.z_project(const.ProjectionType(self.segmentation_type))
 
-        M = self.__combine_global_and_local_thresholds(img)
-        M = self.__combine_with_2d_mask(M, mask2d)
+        M = self.__combine_masks(img, mask2d)
         M = self.__clear_borders(M)
 
         if self.do_fill_holes:
@@ -5,6 +5,7 @@
 
 import numpy as np  # type: ignore
 from radiantkit.image import Image, ImageBinary, ImageLabeled, are_pixels_binary
+from scipy import ndimage as ndi  # type: ignore
 from typing import List, Tuple
 
 
@@ -39,6 +40,12 @@ class BoundingElement(object):
             )
         return BoundingElement(tuple(axes_bounds))
 
+    @staticmethod
+    def from_slices(axes_bounds: Tuple[slice, ...]) -> "BoundingElement":
+        return BoundingElement(
+            tuple([slice(int(s.start), int(s.stop)) for s in axes_bounds])
+        )
+
     @staticmethod
     def from_binary_image(B: ImageBinary) -> "BoundingElement":
         assert are_pixels_binary(B.pixels)
@@ -46,15 +53,19 @@ class BoundingElement(object):
 
     @staticmethod
     def from_labeled_image(L: ImageLabeled, key: int) -> "BoundingElement":
-        assert key in L.pixels
-        return BoundingElement.from_binary_pixels(L.pixels == key)
+        assert key > 0
+        bounds = ndi.find_objects(L.pixels, max_label=key)[key - 1]
+        assert bounds is not None, f"label {key} not found."
+        return BoundingElement.from_slices(bounds)
 
     def apply_to_pixels(self, pixels: np.ndarray) -> np.ndarray:
         assert len(self._bounds) == len(pixels.shape), (self._bounds, pixels.shape)
         return pixels[self._bounds].copy()
 
-    def apply(self, img: Image) -> np.ndarray:
-        return self.apply_to_pixels(img.pixels)
+    def apply(self, img: Image, copy: bool = True) -> np.ndarray:
+        assert len(self._bounds) == len(img.shape), (self._bounds, img.shape)
+        pixels = img.crop(self._bounds)
+        return pixels.copy() if copy else pixels
 
     def offset(self, offset: int) -> "BoundingElement":
         offset_bounds: List[slice] = []
@@ -4,7 +4,7 @@
 """
 
 import argparse
-import itertools
+import gzip
 from joblib import cpu_count, delayed, Parallel  # type: ignore
 import logging
 import numpy as np  # type: ignore
@@ -15,11 +15,12 @@ from radiantkit import argtools
 from radiantkit.distance import CenterType, RadialDistanceCalculator
 from radiantkit.channel import ImageGrayScale, ChannelList
 from radiantkit.image import ImageBinary, ImageLabeled
-from radiantkit.path import find_re, get_image_details
+from radiantkit.path import DirEntries, find_re, get_image_details, scan_directory
 from radiantkit.path import select_by_prefix_and_suffix
 from radiantkit.particle import Nucleus, Particle, ParticleFinder
 from radiantkit import stat
 from rich.progress import track  # type: ignore
+from skimage.filters import threshold_otsu  # type: ignore
 from typing import Dict, List, Tuple
 from typing import Iterator, Optional, Pattern, Type
 
@@ -174,17 +175,20 @@ class Series(ChannelList):
         assert channel_name in self.names
         assert all([p.has_distances for p in self._particles])
 
+        img = self[channel_name][1]
+        img2_segment = img.threshold_global(threshold_otsu(self["tmr"][1].pixels))
+
         particle_details: List[pd.DataFrame] = []
         if self.reference is not None and self.reference != channel_name:
             for p in self._particles:
                 tabulated_details = p.get_intensity_at_distance(
-                    self[channel_name][1], self["tmr"][1], self[self.reference][1] #ADDED
+                    img, img2_segment, self[self.reference][1] #ADDED
                 )
                 particle_details.append(tabulated_details)
             self.unload(self.reference)
         else:
             for p in self._particles:
-                tabulated_details = p.get_intensity_at_distance(self[channel_name][1], self["tmr"][1]) #ADDED
+                tabulated_details = p.get_intensity_at_distance(img, img2_segment) #ADDED
                 particle_details.append(tabulated_details)
         df = pd.concat(particle_details)
         self.unload(channel_name)
@@ -216,6 +220,7 @@ class SeriesList(object):
     series: List[Series]
     label: Optional[str] = None
     __current_series: int = 0
+    __channel_names: Optional[Tuple[List[Series], List[str]]] = None
 
     def __init__(self, name: str = "", series_list: List[Series] = []):
         super(SeriesList, self).__init__()
@@ -224,7 +229,12 @@ class SeriesList(object):
 
     @property
     def channel_names(self) -> List[str]:
-        return list(set(itertools.chain(*[s.names for s in self.series])))
+        # Cached for the current series list, which is replaced (not edited)
+        # whenever the series are re-computed.
+        if self.__channel_names is None or self.__channel_names[0] is not self.series:
+            names = list(set().union(*[s.names for s in self.series]))
+            self.__channel_names = (self.series, names)
+        return self.__channel_names[1].copy()
 
     @staticmethod
     def __initialize_channels(
@@ -308,10 +318,11 @@ class SeriesList(object):
         labeled: bool = False,
         ground_block_side: Optional[int] = None,
         do_rescale: bool = False,
+        entries: Optional[DirEntries] = None,
     ):
 
         masks, channels = select_by_prefix_and_suffix(
-            dpath, find_re(dpath, inreg), *maskfix
+            dpath, find_re(dpath, inreg, entries), *maskfix
         )
         series: SeriesDict = {}
 
@@ -336,11 +347,15 @@ class SeriesList(object):
         threads: int = 1,
     ) -> None:
         threads = max(1, min(cpu_count(), threads))
-        if 1 == threads:
+        if 1 == threads or 1 >= len(self):
             for series in track(self):
                 series.init_particles(particleClass, channel_list)
         else:
-            self.series = Parallel(n_jobs=threads, verbose=11)(
+            # Masks are unloaded in the workers before returning, so only the
+            # series metadata and per-particle crops travel back.
+            self.series = Parallel(
+                n_jobs=min(threads, len(self)), backend="loky", verbose=11
+            )(
                 delayed(Series.extract_particles)(series, particleClass, channel_list)
                 for series in self
             )
@@ -608,8 +623,16 @@ class SeriesList(object):
     def to_pickle(self, dpath: str, pickle_name: str = "radiant.pkl") -> None:
         assert os.path.isdir(dpath)
         pickle_path = os.path.join(dpath, pickle_name)
-        with open(pickle_path, "wb") as PO:
-            pickle.dump(self, PO)
+        with gzip.open(pickle_path, "wb", compresslevel=1) as PO:
+            pickle.dump(self, PO, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def from_pickle(pickle_path: str) -> "SeriesList":
+        with open(pickle_path, "rb") as PI:
+            is_gzipped = b"\x1f\x8b" == PI.read(2)
+        # Instances pickled before compression was introduced are plain files
+        with (gzip.open if is_gzipped else open)(pickle_path, "rb") as PI:
+            return pickle.load(PI)
 
     def unload(self, name: Optional[str] = None) -> None:
         for series in self.series:
@@ -640,15 +663,15 @@ def init_series_list(
     series_list = None
     pickle_path = os.path.join(args.input, args.pickle_name)
     args = argtools.set_default_args_for_series_init(args)
+    entries = scan_directory(args.input)
 
-    if os.path.exists(pickle_path):
+    if args.pickle_name in entries:
         if not args.import_instance:
             logging.info(f"found '{args.pickle_name}' file in input folder.")
             logging.info("use --import-instance flag to unpickle it.")
         if args.import_instance:
-            with open(pickle_path, "rb") as PI:
-                series_list = pickle.load(PI)
-                pickled = True
+            series_list = SeriesList.from_pickle(pickle_path)
+            pickled = True
 
     if series_list is None:
         logging.info("parsing series folder")
@@ -661,6 +684,7 @@ def init_series_list(
             args.labeled,
             args.block_side,
             args.do_rescaling,
+            entries,
         )
 
     logging.info(
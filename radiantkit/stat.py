@@ -9,7 +9,7 @@ import numpy as np  # type: ignore
 from numpy.polynomial.polynomial import Polynomial  # type: ignore
 import pandas as pd  # type: ignore
 import scipy as sp  # type: ignore
-from typing import Any, Callable, DefaultDict, Dict, List, Optional, Tuple
+from typing import Any, DefaultDict, Dict, List, Optional, Tuple
 import warnings
 
 
@@ -114,15 +114,20 @@ def gpartial(V: np.ndarray, d: int, sigma: float) -> np.ndarray:
 
 
 def gaussian(x: np.ndarray, k: float, loc: float, scale: float) -> float:
-    return k * sp.stats.norm.pdf(x, loc=loc, scale=scale)
+    # Same as k * sp.stats.norm.pdf(x, loc, scale), without the per-call
+    # argument checks of rv_continuous, as curve_fit calls this many times.
+    if not scale > 0:
+        return np.full(np.shape(x), np.nan)
+    y = (np.asarray(x) - loc) / scale
+    return k * (np.exp(-(y ** 2) / 2.0) / np.sqrt(2 * np.pi) / scale)
 
 
 def gaussian_fit(xx: np.ndarray) -> Optional[np.ndarray]:
-    df = sp.stats.gaussian_kde(xx)
+    density = sp.stats.gaussian_kde(xx)(xx)
     sd = np.std(xx)
-    params = [df(xx).max() * sd / 4 * np.sqrt(2 * np.pi), np.mean(xx), sd]
+    params = [density.max() * sd / 4 * np.sqrt(2 * np.pi), np.mean(xx), sd]
     with warnings.catch_warnings():
-        fitted_params, _ = sp.optimize.curve_fit(gaussian, xx, df(xx), p0=params)
+        fitted_params, _ = sp.optimize.curve_fit(gaussian, xx, density, p0=params)
     if all(fitted_params == params):
         return None
     return fitted_params
@@ -143,12 +148,12 @@ def sog(
 
 
 def try_sog_curve_fit(
-    xx: np.ndarray, starting_params: np.ndarray, df: Callable
+    xx: np.ndarray, starting_params: np.ndarray, density: np.ndarray
 ) -> Optional[np.ndarray]:
     try:
         with warnings.catch_warnings():
             fitted_params, _ = sp.optimize.curve_fit(
-                sog, xx, df(xx), p0=starting_params
+                sog, xx, density, p0=starting_params
             )
             if fitted_params[1] > fitted_params[4]:
                 fitted_params = np.array([*fitted_params[3:], *fitted_params[:3]])
@@ -159,11 +164,12 @@ def try_sog_curve_fit(
 
 def sog_fit(xx: np.ndarray) -> Optional[np.ndarray]:
     df = sp.stats.gaussian_kde(xx)
+    density = df(xx)
     loc2 = np.mean(xx) + 2.5 * np.std(xx)
     sd1 = np.std(xx)
     starting_params = np.array(
         [
-            df(xx).max() * sd1 / 4 * np.sqrt(2 * np.pi),
+            density.max() * sd1 / 4 * np.sqrt(2 * np.pi),
             np.mean(xx),
             sd1,
             df(loc2)[0] * sd1 / 4 * np.sqrt(2 * np.pi),
@@ -171,7 +177,7 @@ def sog_fit(xx: np.ndarray) -> Optional[np.ndarray]:
             sd1 / 4,
         ]
     )
-    fitted_params = try_sog_curve_fit(xx, starting_params, df)
+    fitted_params = try_sog_curve_fit(xx, starting_params, density)
     if fitted_params is None:
         return None  # Error occurred
     if all(fitted_params == starting_params):
@@ -0,0 +1,80 @@
+"""
+@author: Gabriele Girelli
+@contact: gigi.ga90@gmail.com
+"""
+
+import io
+import numpy as np  # type: ignore
+from nd2reader import ND2Reader  # type: ignore
+from radiantkit.conversion import ND2Parser, ND2Reader2
+import struct
+import threading
+from typing import Dict
+
+
+class ImageGroupLabelMap(object):
+    def __init__(self, locations: Dict[int, int]):
+        super(ImageGroupLabelMap, self).__init__()
+        self.locations = locations
+
+    def get_image_data_location(self, image_group_number: int) -> int:
+        return self.locations[image_group_number]
+
+
+def mk_parser(
+    height: int, width: int, nchannels: int, nz: int, row_padding: int = 0
+) -> ND2Parser:
+    fh = io.BytesIO()
+    locations = {}
+    for z in range(nz):
+        group = np.zeros(4 + height * (width * nchannels + row_padding), "uint16")
+        group[4:] = np.arange(group.shape[0] - 4) + 1000 * z
+        locations[z] = fh.tell()
+        fh.write(struct.pack("IIQ", 0xABECEDA, 0, group.nbytes))
+        fh.write(group.tobytes())
+
+    parser = ND2Parser.__new__(ND2Parser)
+    parser._fh = fh
+    parser._label_map = ImageGroupLabelMap(locations)
+    parser.metadata = dict(
+        height=height,
+        width=width,
+        z_levels=list(range(nz)),
+        fields_of_view=[0],
+        channels=[f"c{c}" for c in range(nchannels)],
+    )
+    return parser
+
+
+def mk_reader(reader_type: type, parser: ND2Parser) -> ND2Reader:
+    reader = reader_type.__new__(reader_type)
+    reader._parser = parser
+    reader.metadata = parser.metadata
+    if reader_type is ND2Reader2:
+        reader._ND2Reader2__image_group_lock = threading.Lock()
+    return reader
+
+
+def check_frames_match_nd2reader(parser: ND2Parser) -> None:
+    reader = mk_reader(ND2Reader, parser)
+    reader2 = mk_reader(ND2Reader2, parser)
+    for z in parser.metadata["z_levels"]:
+        for c in range(len(parser.metadata["channels"])):
+            frame = reader.get_frame_2D(c=c, z=z)
+            frame2 = reader2.get_frame_2D(c=c, z=z)
+            assert frame.shape == frame2.shape
+            assert np.array_equal(frame, frame2)
+
+
+def test_ND2Reader2_get_frame_2D():
+    check_frames_match_nd2reader(mk_parser(3, 4, 2, 3))
+    check_frames_match_nd2reader(mk_parser(5, 4, 1, 2))
+
+
+def test_ND2Reader2_get_frame_2D_stitched():
+    check_frames_match_nd2reader(mk_parser(3, 4, 2, 2, row_padding=1))
+
+
+def test_ND2Reader2_get_frame_2D_fallback(monkeypatch):
+    monkeypatch.setattr("radiantkit.conversion.remove_parsed_unwanted_bytes", None)
+    check_frames_match_nd2reader(mk_parser(3, 4, 2, 3))
@@ -0,0 +1,144 @@
+"""
+@author: Gabriele Girelli
+@contact: gigi.ga90@gmail.com
+"""
+
+import numpy as np  # type: ignore
+import os
+import pytest
+from radiantkit.image import Image, ImageLabeled
+from radiantkit.image import clear_XY_borders, get_kept_labels, remove_labels
+from radiantkit.image import needs_bigtiff, read_tiff, save_tiff, threshold_adaptive
+from skimage.filters import threshold_local  # type: ignore
+from skimage.segmentation import clear_border  # type: ignore
+import tempfile
+import tifffile as tf  # type: ignore
+
+
+def test_copy_detaches_memmapped_pixels():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "img.tif")
+        save_tiff(path, np.arange(24, dtype="uint8").reshape(2, 3, 4), False)
+        assert not isinstance(read_tiff(path), np.memmap)
+        img = Image(read_tiff(path, mmap=True), path)
+        assert isinstance(img.pixels, np.memmap)
+
+        img2 = img.copy()
+        assert not isinstance(img2.pixels, np.memmap)
+        img2.pixels[0, 0, 0] = 100
+        assert 0 == img.pixels[0, 0, 0]
+
+
+def test_to_tiff_overwrites_source():
+    pixels = np.arange(24, dtype="uint8").reshape(2, 3, 4)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "img.tif")
+        save_tiff(path, pixels, False)
+        Image.from_tiff(path).to_tiff(path, compressed=True)
+        assert np.array_equal(pixels, read_tiff(path).reshape(pixels.shape))
+
+
+def test_clear_XY_borders_2D():
+    L = np.zeros((6, 6), dtype="uint16")
+    L[0, 1] = 1
+    L[2:4, 2:4] = 3
+    L[5, 4:] = 4
+    L[1, 4] = 6
+    L_input = L.copy()
+    L2 = clear_XY_borders(L)
+    assert np.array_equal(clear_border(L), L2)
+    assert [0, 3, 6] == np.unique(L2).tolist()
+    assert np.array_equal(L_input, L)
+
+
+def test_clear_XY_borders_3D():
+    L = np.zeros((3, 5, 5), dtype="uint16")
+    L[1, 1:3, 0] = 2
+    L[0, 2, 2] = 5
+    L[2, 2:4, 1:4] = 7
+    L[1, 4, 3] = 9
+    assert [0, 1, 2] == np.unique(clear_XY_borders(L.copy())).tolist()
+    L2 = clear_XY_borders(L.copy(), compact=False)
+    assert [0, 5, 7] == np.unique(L2).tolist()
+    assert np.array_equal(np.where(np.isin(L, [5, 7]), L, 0), L2)
+
+
+def mk_labels_with_gaps() -> np.ndarray:
+    L = np.zeros((3, 6, 6), dtype="uint16")
+    L[1, 1, 1] = 2
+    L[0, 3:5, 1:3] = 5
+    L[:, 1:4, 4] = 9
+    return L
+
+
+def test_get_kept_labels():
+    L = mk_labels_with_gaps()
+    keep = get_kept_labels(L, np.array([5]), np.array([], dtype="uint16"))
+    assert 10 == keep.shape[0]
+    assert [0, 1, 2, 3, 4, 6, 7, 8, 9] == np.flatnonzero(keep).tolist()
+    keep = get_kept_labels(L, np.array([2, 12]), np.array([]))
+    assert 13 == keep.shape[0]
+    assert not keep[2] and not keep[12] and keep[9]
+
+
+def test_remove_labels():
+    L = mk_labels_with_gaps()
+    L2 = remove_labels(L.copy(), np.array([2, 9]))
+    assert [0, 5] == np.unique(L2).tolist()
+    assert np.array_equal(np.where(5 == L, L, 0), L2)
+    L2 = remove_labels(L.copy(), np.array([3, 12]))
+    assert np.array_equal(L, L2)
+
+
+def test_ImageLabeled_filter_total_size():
+    L = ImageLabeled(mk_labels_with_gaps(), doRelabel=False)
+    L.filter_total_size((2, 5))
+    assert [0, 1] == np.unique(L.pixels).tolist()
+    assert np.array_equal(5 == mk_labels_with_gaps(), 1 == L.pixels)
+
+
+def test_ImageLabeled_filter_size():
+    L = ImageLabeled(mk_labels_with_gaps(), axes="ZYX", doRelabel=False)
+    L.filter_size("Z", (2, 3))
+    assert np.array_equal(9 == mk_labels_with_gaps(), 0 != L.pixels)
+    L = ImageLabeled(mk_labels_with_gaps(), axes="ZYX", doRelabel=False)
+    L.filter_size("XY", (2, 4))
+    assert np.array_equal(np.isin(mk_labels_with_gaps(), [5, 9]), 0 != L.pixels)
+
+
+def test_needs_bigtiff():
+    assert not needs_bigtiff(2 ** 32 - 2 ** 25)
+    assert needs_bigtiff(2 ** 32 - 2 ** 25 + 1)
+
+
+def test_save_tiff_bigtiff(monkeypatch):
+    monkeypatch.setattr("radiantkit.image.needs_bigtiff", lambda nbytes: True)
+    img = np.arange(24, dtype="uint8").reshape(2, 3, 4)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "img.tif")
+        save_tiff(path, img, True, forImageJ=False)
+        with tf.TiffFile(path) as tiff:
+            assert tiff.is_bigtiff
+        save_tiff(path, img, True)
+        with tf.TiffFile(path) as tiff:
+            assert tiff.is_bigtiff and not tiff.is_imagej
+        save_tiff(path, img, False)
+        with tf.TiffFile(path) as tiff:
+            assert not tiff.is_bigtiff and tiff.is_imagej
+
+
+def test_threshold_adaptive_mean():
+    rng = np.random.default_rng(1)
+    img = rng.random((4, 32, 32))
+    for mode, kwargs in [
+        ("constant", dict(offset=0.05, cval=0.5)),
+        ("reflect", dict(offset=-0.1)),
+    ]:
+        mask = threshold_adaptive(img, (1, 7, 7), "mean", mode, param=3, **kwargs)
+        for slice_id in range(img.shape[0]):
+            threshold = threshold_local(
+                img[slice_id], 7, method="mean", mode=mode, **kwargs
+            )
+            assert np.array_equal(img[slice_id] >= threshold, mask[slice_id])
+    with pytest.raises(TypeError):
+        threshold_adaptive(img, 7, "mean", "constant", 0.05)
@@ -0,0 +1,38 @@
+"""
+@author: Gabriele Girelli
+@contact: gigi.ga90@gmail.com
+"""
+
+import numpy as np  # type: ignore
+from radiantkit.image import ImageGrayScale
+from radiantkit.particle import NucleiList, Nucleus
+from radiantkit.selection import BoundingElement
+
+
+def mk_nucleus(idx: int) -> Nucleus:
+    mask = np.zeros((3, 3, 3), dtype="bool")
+    mask[:2, :2, :2] = True
+    nucleus = Nucleus(mask, BoundingElement(tuple([slice(0, 3)] * 3)))
+    nucleus.idx = idx
+    nucleus.source = "fov.tif"
+    return nucleus
+
+
+def test_nuclei_list_data_includes_features_added_later():
+    nuclei = [mk_nucleus(1), mk_nucleus(2)]
+    nl = NucleiList(nuclei)
+
+    img = ImageGrayScale(np.ones((3, 3, 3), dtype="float64"))
+    for nucleus in nuclei:
+        nucleus.init_intensity_features(img, "dapi")
+
+    data = nl.get_data()
+    assert "isum_dapi" in data.columns
+    assert [8, 8] == data["isum_dapi"].tolist()
+    assert [1, 2] == data["label"].tolist()
+
+
+def test_nuclei_list_concat():
+    nl = NucleiList.concat([NucleiList([mk_nucleus(1)]), NucleiList([mk_nucleus(2)])])
+    assert 2 == len(nl)
+    assert [1, 2] == nl.get_data()["label"].tolist()
@@ -0,0 +1,32 @@
+"""
+@author: Gabriele Girelli
+@contact: gigi.ga90@gmail.com
+"""
+
+import numpy as np  # type: ignore
+from radiantkit.image import ImageGrayScale
+from radiantkit.segmentation import Binarizer
+from scipy import ndimage as ndi  # type: ignore
+
+
+def mk_stack() -> np.ndarray:
+    rng = np.random.default_rng(1)
+    return ndi.gaussian_filter(rng.random((20, 48, 48)), 2) * 1000
+
+
+def binarize(pixels: np.ndarray, chunk_size: int, local_side) -> np.ndarray:
+    binarizer = Binarizer()
+    binarizer.closing_side = 5
+    binarizer.local_side = local_side
+    binarizer.chunk_size = chunk_size
+    binarizer.do_clear_XY_borders = False
+    return binarizer.run(ImageGrayScale(pixels.copy())).pixels
+
+
+def test_binarizer_chunks_match_whole_stack():
+    pixels = mk_stack()
+    for local_side in [11, (3, 11, 11)]:
+        whole = binarize(pixels, pixels.shape[0], local_side)
+        assert whole.any() and not whole.all()
+        for chunk_size in [1, 2, 16, pixels.shape[0] + 1]:
+            assert np.array_equal(whole, binarize(pixels, chunk_size, local_side))